@@ -1,6 +1,10 @@
 from PyQt5.QtCore import QObject, pyqtSignal
-from abc import ABCMeta, abstractmethod
+from abc import ABCMeta
+from types import MappingProxyType
+from typing import ClassVar, Mapping
 from typing_extensions import final
+from pathlib import Path
+import sys
 import weakref
 
 class ABCMetaQ(type(QObject), ABCMeta):
@@ -23,15 +27,14 @@ class BaseModule(QObject, metaclass=ABCMetaQ):
         get_module_name: 获取模块名称（基类实现禁止重写）
         check_module_name: 检查模块名称是否重名
         __init_subclass__: 子类初始化时检查模块名称是否重名
-        module_name：必须实现的模块名称属性，@property装饰器实现的属性，访问时不需要加括号
+        module_name：必须声明的模块名称，写成类属性（字符串），类定义时即可读取并注册
+                    旧写法 @property 返回常量字符串仍可识别
         使用示例：
             class TestModuleA(BaseModule):
+                module_name = "test_module_a"
+
                 def __init__(self):
                     super().__init__()
-                    
-                @property
-                def module_name(self):
-                    return "test_module_a"
                 #以下两种方式都可以在模块中获取模块名称
                 def test(self):
                     print(self.module_name)
@@ -42,17 +45,57 @@ class BaseModule(QObject, metaclass=ABCMetaQ):
                     super().__init__()
                     self.testModuleA = TestModuleA()
                     self.module_name_A = self.testModuleA.get_module_name()
+    -信号：
+        health_changed(name, status): 模块健康状态变化时发出，服务总线据此更新健康表
     """
     _module_manespace = weakref.WeakValueDictionary()  # 弱引用注册表
-    _class_id_registry = {}  # {ID: 类}
+    _class_id_registry = weakref.WeakValueDictionary()  # {ID: 类}，弱引用，插件卸载后旧类可被回收
     _name_to_id_registry = {}  # {模块名称: ID}
+    _id_to_name_registry = {}  # {ID: 模块名称}，注册时增量维护
     _next_id = 1  # 下一个可用ID
+    # 注册表的只读视图：随注册表实时更新，读取时不复制
+    _forward_view = MappingProxyType(_id_to_name_registry)
+    _reverse_view = MappingProxyType(_name_to_id_registry)
+
+    module_name: ClassVar[str] = ""  # 模块名称，子类必须以类属性声明
+    health_changed = pyqtSignal(str, str)  # (模块名称, 健康状态)，状态变化时由模块自行发出
+
+    @classmethod
+    def _class_module_name(cls) -> str:
+        """在类上读取模块名称；兼容旧写法（@property 返回常量字符串）"""
+        name = cls.module_name
+        if isinstance(name, property):
+            name = name.fget(cls)
+        return name
+
+    @classmethod
+    def _has_abstract_methods(cls) -> bool:
+        """按 ABCMeta 的规则判断类是否仍有未实现的抽象方法
+        （__init_subclass__ 执行时 ABCMeta 还没有计算 __abstractmethods__，不能用 inspect.isabstract）"""
+        if any(getattr(v, "__isabstractmethod__", False) for v in cls.__dict__.values()):
+            return True
+        return any(getattr(getattr(cls, name, None), "__isabstractmethod__", False)
+                   for base in cls.__bases__ for name in getattr(base, "__abstractmethods__", ()))
+
+    @staticmethod
+    def _plugin_dir_of(klass: type):
+        """插件类所在的插件目录（using_plugins/<插件名>）；不是由插件管理器加载的类返回 None
+        插件每个版本以 plugins_<插件名>_<版本> 单独导入，文件位于 <插件目录>/<版本>/ 下"""
+        if not klass.__module__.startswith("plugins_"):
+            return None
+        file = getattr(sys.modules.get(klass.__module__), "__file__", None)
+        return Path(file).resolve().parent.parent if file else None
 
-    @property
-    @abstractmethod
-    def module_name(self) -> str:
-        """必须实现的模块名称属性"""
-        pass
+    @classmethod
+    def _can_replace(cls, existing_cls: type) -> bool:
+        """同名模块已注册时，判断新类能否替换旧类：
+        同一模块文件中的同一个类（重新加载）、旧类所在模块已卸载、同一插件的另一个版本"""
+        if (existing_cls.__module__, existing_cls.__qualname__) == (cls.__module__, cls.__qualname__):
+            return True
+        if existing_cls.__module__ not in sys.modules:
+            return True
+        plugin_dir = cls._plugin_dir_of(cls)
+        return plugin_dir is not None and plugin_dir == cls._plugin_dir_of(existing_cls)
 
     @final
     def get_module_name(self) -> str:
@@ -84,42 +127,43 @@ class BaseModule(QObject, metaclass=ABCMetaQ):
     @final
     def get_name_by_id(cls, id_: int) -> str:
         """通过ID获取模块名称"""
-        if class_ := cls._class_id_registry.get(id_):
-            return class_.module_name
-        return None
+        return cls._id_to_name_registry.get(id_)
     
     @classmethod
     @final
-    def get_forward_dict(cls) -> dict:
-        """获取正向字典 {ID: 模块名称}"""
-        return {id_: class_.module_name 
-                for id_, class_ in cls._class_id_registry.items()}
+    def get_forward_dict(cls) -> Mapping[int, str]:
+        """获取正向字典 {ID: 模块名称}（只读视图，需要修改时请 dict() 复制）"""
+        return cls._forward_view
     
     @classmethod
     @final
-    def get_reverse_dict(cls) -> dict:
-        """获取反向字典 {模块名称: ID}"""
-        return cls._name_to_id_registry.copy()
+    def get_reverse_dict(cls) -> Mapping[str, int]:
+        """获取反向字典 {模块名称: ID}（只读视图，需要修改时请 dict() 复制）"""
+        return cls._reverse_view
 
     @final
     def __init_subclass__(cls, **kwargs):
         """该方法在子类完成定义后被调用，导入文件时会自动执行"""
         super().__init_subclass__(**kwargs)
-        # 检查子类是否实现了模块名称属性
-        if not hasattr(cls, 'module_name'):
-            raise TypeError(f"模块 {cls.__name__} 必须实现 'module_name' 属性")
-        if not cls.module_name:
-            raise ValueError("模块名称不能为空")
-        # 注册模块并检查重复
-        if cls.module_name in cls._module_manespace:
-            raise ValueError(f"模块名称 '{cls.module_name}' 已被 {cls._module_manespace[cls.module_name]} 占用")
-        cls._module_manespace[cls.module_name] = cls  # 存储类引用
-
-        if cls.module_name not in cls._name_to_id_registry:
-            new_id = cls._next_id
-            cls._next_id += 1
-            
-            cls._class_id_registry[new_id] = cls
-            cls._name_to_id_registry[cls.module_name] = new_id
-
+        # 中间抽象类不注册
+        if cls._has_abstract_methods():
+            return
+        # 检查子类是否声明了模块名称
+        name = cls._class_module_name()
+        if not isinstance(name, str) or not name:
+            raise TypeError(f"模块 {cls.__name__} 必须以类属性声明非空的 'module_name'")
+        # 注册模块并检查重复；重新加载、旧类已卸载或同一插件升级到新版本时用新类替换旧类
+        # 不同文件里同名的类（如 net_udp_que 的客户端与服务端）仍算重名
+        existing_cls = BaseModule._module_manespace.get(name)
+        if existing_cls is not None and not cls._can_replace(existing_cls):
+            raise ValueError(f"模块名称 '{name}' 已被 {existing_cls} 占用")
+        BaseModule._module_manespace[name] = cls  # 存储类引用
 
+        # ID 计数器和注册表都写在 BaseModule 上，避免 cls._next_id += 1 在子类上生成新属性导致 ID 重复
+        id_ = BaseModule._name_to_id_registry.get(name)
+        if id_ is None:
+            id_ = BaseModule._next_id
+            BaseModule._next_id += 1
+            BaseModule._name_to_id_registry[name] = id_
+            BaseModule._id_to_name_registry[id_] = name
+        BaseModule._class_id_registry[id_] = cls
@@ -175,9 +175,7 @@ class AutoDatabaseMigrator(DatabaseMigrator,BaseModule):
         self.max_retries = max_retries
         self.running = False
         self.modelsReload=ModelReloader()
-    @property
-    def module_name(self) -> str:
-        return "auto_migrate"
+    module_name = "auto_migrate"
     def start_mig(self):
         try:
             self.clean_matebase()
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, URL, text
+from sqlalchemy import create_engine, URL, text, insert
 from sqlalchemy.orm import session, sessionmaker, declarative_base, scoped_session
 from contextlib import contextmanager, AbstractContextManager
 from typing import Type, TypeVar, Generic, Any, List,Union
@@ -108,6 +108,18 @@ class Database:
             session.bulk_save_objects(instances)
         return instances
 
+    def bulk_insert(self, model: Type[Model], rows: List[dict]) -> int:
+        """批量插入字典数据（单条 INSERT ... VALUES 多行，不构造 ORM 对象）
+        :param model: 目标模型类
+        :param rows: [{字段名: 值}, ...]
+        :return: 插入行数
+        """
+        if not rows:
+            return 0
+        with self.session_scope() as session:
+            session.execute(insert(model), rows)
+        return len(rows)
+
     def get(self, model: Type[Model], **filters) -> Model | None:
         """获取单个记录"""
         with self.session_scope() as session:
@@ -123,6 +135,22 @@ class Database:
         with self.session_scope() as session:
             return session.query(model).filter_by(**filters).offset((page-1)*per_page).limit(per_page)
 
+    def keyset_page(self, model: Type[Model], last_id: int = 0, limit: int = 50, **filters) -> list[Model]:
+        """按主键游标分页：WHERE id > last_id ORDER BY id LIMIT n
+        与 offset 分页不同，翻到后面的页时数据库不需要扫描并丢弃前面的行。
+        调用方保存本页最后一条记录的 id，作为下一页的 last_id。
+        """
+        with self.session_scope() as session:
+            rows = (session.query(model)
+                    .filter_by(**filters)
+                    .filter(model.id > last_id)
+                    .order_by(model.id)
+                    .limit(limit)
+                    .all())
+            # 提交前从会话中移出，避免 commit 使属性过期，离开会话后仍可读取
+            session.expunge_all()
+            return rows
+
     def stream(self, model: Type[Model], batch_size: int = 1000, **filters):
         """流式加载数据"""
         with self.session_scope() as session:
@@ -197,9 +225,7 @@ class DatabaseManager(BaseModule):
             if self._dbs:
                 self.current_db = next(iter(self._dbs.values()))
 
-    @property
-    def module_name(self) -> str:
-        return "database_manager"
+    module_name = "database_manager"
 
     def parse_config(self, config_path: str):
         """
@@ -20,11 +20,11 @@ class Users(GeneralStorageBaseModel):
     }
     __abstract__ =  False
     id = Column(Integer, primary_key=True, autoincrement=True)  # 主键，自增
-    name = Column(String(50), nullable=False)  # 非空字符串字段
+    name = Column(String(50), nullable=False, index=True)  # 非空字符串字段，常用查询条件建索引
     age = Column(Integer,default = 18)  # 整数字段
-    email = Column(String(100), unique=True)  # 唯一字符串字段
-    created_at = Column(DateTime, default=datetime)  # 日期时间字段，默认当前时间
-    updated_at = Column(DateTime, default=datetime, onupdate=datetime.now)
+    email = Column(String(100), unique=True)  # 唯一字符串字段（unique 已自带索引）
+    created_at = Column(DateTime, default=datetime.now)  # 日期时间字段，默认当前时间
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 
 class Datas2(DataStorageBaseModel):
@@ -54,8 +54,8 @@ class Users2(GeneralStorageBaseModel):
     age = Column(Integer,default = 18)  # 整数字段
     email = Column(String(100), unique=True)  # 唯一字符串字段
     data = Column(Integer, default = 0)  # 整数字段
-    created_at = Column(DateTime, default=datetime)  # 日期时间字段，默认当前时间
-    updated_at = Column(DateTime, default=datetime, onupdate=datetime.now)
+    created_at = Column(DateTime, default=datetime.now)  # 日期时间字段，默认当前时间
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
 
 class Users3(GeneralStorageBaseModel):
     __tablename__ = 'users3'  # 表名
@@ -68,5 +68,5 @@ class Users3(GeneralStorageBaseModel):
     age = Column(Integer,default = 18)  # 整数字段
     email = Column(String(100), unique=True)  # 唯一字符串字段
     data = Column(Integer, default = 0)  # 整数字段
-    created_at = Column(DateTime, default=datetime)  # 日期时间字段，默认当前时间
-    updated_at = Column(DateTime, default=datetime, onupdate=datetime.now)
\ No newline at end of file
+    created_at = Column(DateTime, default=datetime.now)  # 日期时间字段，默认当前时间
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
\ No newline at end of file
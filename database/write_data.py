@@ -28,9 +28,7 @@ class WriteData(BaseModule):
         # 权限管理
         self._module_writer_per = {}
     
-    @property
-    def module_name(self) -> str:
-        return "write_data"
+    module_name = "write_data"
     
     def _register_signals(self):
         """注册并连接信号"""
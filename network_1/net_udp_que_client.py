@@ -97,9 +97,7 @@ class NetUDPQue(BaseModule):
             print("错误：线程池服务 'thread' 未注册，请检查 CoreServiceBus")  
         
         
-    @property
-    def module_name(self):
-        return "net_udp_que"
+    module_name = "net_udp_que"
             
     def _queue_send_data(self, mode_name: str, data: dict):
         """将发送请求加入队列"""
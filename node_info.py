@@ -265,9 +265,7 @@ class NodeInfo(BaseModule):
         self._nodeGenerateId: str = SystemIdentity.generate_identity()
         self._initialize()
         
-    @property    
-    def module_name(self) -> str:
-        return "nodeInfo"
+    module_name = "nodeInfo"
     
     def _initialize(self):
         """配置初始化"""
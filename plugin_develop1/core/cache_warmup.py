@@ -0,0 +1,36 @@
+#更新服务启动时的缓存预热
+# 对路由实际会访问的插件文件（<插件目录>/<插件名>.py）预先计算版本号和内容哈希，
+# 之后的版本检查和下载（ETag）请求直接命中 version_utils / hash_utils 中的缓存。
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from core.hash_utils import file_hash
+from core.version_utils import plugin_version
+
+logger = logging.getLogger(__name__)
+
+
+def _warm_one(plugin_path: Path) -> None:
+    plugin_version(plugin_path)
+    try:
+        file_hash(plugin_path)
+    except OSError as e:  # 预热期间文件被删除或无法读取，留给请求时再处理
+        logger.warning("预热插件 %s 哈希失败: %s", plugin_path, e)
+
+
+def warm_plugin_caches(plugin_dir: Path, plugin_names: Optional[Iterable[str]] = None,
+                       max_workers: int = 8) -> None:
+    """并发预热 plugin_dir 下插件的版本与哈希缓存；plugin_names 为空时预热目录下全部插件
+    路径与路由中的 plugin_dir / f"{plugin_name}.py" 完全一致，保证缓存键能被请求命中"""
+    plugin_dir = Path(plugin_dir)
+    if plugin_names is None:
+        paths = sorted(plugin_dir.glob("*.py"))
+    else:
+        paths = [plugin_dir / f"{name}.py" for name in plugin_names]
+    if not paths:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths))) as ex:
+        list(ex.map(_warm_one, paths))
+    logger.info("已预热 %d 个插件的版本与哈希缓存", len(paths))
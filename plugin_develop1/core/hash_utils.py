@@ -0,0 +1,35 @@
+#插件文件内容哈希工具
+# 优先使用 blake3（Rust + SIMD 实现，大文件明显快于 sha256），未安装时回退到 hashlib.sha256。
+# 结果按 (st_mtime_ns, st_size) 缓存，文件未变化时不重复计算。
+import hashlib
+from pathlib import Path
+from typing import Dict, Tuple
+
+try:
+    from blake3 import blake3 as _hasher
+except ImportError:  # blake3 为可选依赖
+    _hasher = hashlib.sha256
+
+CHUNK_SIZE = 1 << 20
+_hash_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def file_hash(path, chunk: int = CHUNK_SIZE, use_cache: bool = True) -> str:
+    """计算文件内容哈希（十六进制）；临时文件应传 use_cache=False"""
+    path = Path(path)
+    st = path.stat()
+    key = (st.st_mtime_ns, st.st_size)
+    if use_cache:
+        cached = _hash_cache.get(str(path))
+        if cached and cached[0] == key:
+            return cached[1]
+
+    h = _hasher()
+    with open(path, 'rb') as f:
+        for b in iter(lambda: f.read(chunk), b''):
+            h.update(b)
+    digest = h.hexdigest()
+
+    if use_cache:
+        _hash_cache[str(path)] = (key, digest)
+    return digest
@@ -20,6 +20,8 @@ from pathlib import Path
 from watchdog.events import FileSystemEventHandler
 from watchdog.observers import Observer
 
+from core.version_utils import plugin_version
+
 
 # PluginEventHandler类
 #监听插件文件的变化（如创建、删除、修改）
@@ -150,8 +152,11 @@ class PluginManager:
         if dest.exists():
             backup_dir = Path("backups") / metadata['name']
             backup_dir.mkdir(parents=True, exist_ok=True)
-            timestamp = time.strftime("%Y%m%d%H%M%S")
-            backup_file = backup_dir / f"{metadata['name']}_{timestamp}.py"
+            # 备份一律按 backups/<插件名>/<版本>.py 存放，回滚时可直接定位；
+            # 配置中没有记录版本时，从旧插件文件中静态读取（与更新服务报告的版本号一致）
+            old_version = (self.config["plugins"].get(metadata['name'], {}).get("version")
+                           or plugin_version(dest))
+            backup_file = backup_dir / f"{old_version}.py"
             shutil.copy(dest, backup_file)
             print(f"🗃 已备份旧版本至: {backup_file}")
 
@@ -258,9 +263,8 @@ class PluginManager:
 #回滚插件版本，从备份中恢复插件到指定版本。
     def rollback_plugin(self, plugin_name: str, version: str):
         """版本回滚"""
-        backup_dir = Path("backups") / plugin_name
-        backup_file = next((f for f in backup_dir.glob(f"{plugin_name}_{version}*.py")), None)
-        if backup_file:
+        backup_file = Path("backups") / plugin_name / f"{version}.py"
+        if backup_file.exists():
             current_path = self.plugin_dir / f"{plugin_name}.py"
             shutil.copy(backup_file, current_path)
             self.reload_plugin(plugin_name)
@@ -1,14 +1,19 @@
 #基于 Flask 构建的 插件上传/下载/回滚/版本检查 的后端服务接口
 # 配合插件管理系统，可以实现插件的动态更新、版本管理与回滚。
 #前提：插件统一存放在：<项目根目录>/plugins/
-# 回滚备份存放在：<项目根目录>/backups/<plugin_name>/
+# 回滚备份存放在：<项目根目录>/backups/<plugin_name>/<version>.py
 # 插件以 Python 文件形式存在（如 hello_plugin.py）
 # 插件类中包含 __plugin_metadata__ 字典，描述插件元信息（如版本）
 
-from flask import Flask, request, jsonify, send_file
+from flask import Flask, request, jsonify, send_from_directory
+import os
 import shutil
+import tempfile
 from pathlib import Path
 from core.plugin_manager import PluginManager
+from core.cache_warmup import warm_plugin_caches
+from core.hash_utils import file_hash
+from core.version_utils import compare_versions, find_backup, plugin_version
 
 #初始化一个 Flask Web 服务，提供 REST API 接口供前端或其他模块使用。
 app = Flask(__name__)
@@ -16,30 +21,49 @@ UPLOAD_FOLDER = Path(__file__).resolve().parent.parent / "plugins"#设置上传
 UPLOAD_FOLDER.mkdir(exist_ok=True)
 
 # 上传插件接口
-# 输入：前端通过 form-data 提交的 Python 文件（.py 插件文件）
+# 输入：Python 文件（.py 插件文件），支持两种提交方式：
+#   1. 请求体为原始字节流，Content-Type: application/octet-stream，文件名放在 X-Filename 头中（推荐）
+#   2. form-data 的 file 字段（兼容旧客户端）
+# 文件先分块写入插件目录下的临时文件，再 os.replace 原子替换：内存占用与插件大小无关，上传中断也不会留下半个插件
 @app.route("/upload", methods=["POST"])
 def upload_plugin():
     file = request.files.get("file")
-    if not file:
+    filename = Path(file.filename if file else request.headers.get("X-Filename", "")).name
+    if not filename:
         return jsonify({"error": "未提供文件"}), 400
 
-    save_path = UPLOAD_FOLDER / file.filename
-    file.save(str(save_path))
+    save_path = UPLOAD_FOLDER / filename
+    fd, tmp = tempfile.mkstemp(dir=UPLOAD_FOLDER, prefix=f".{filename}.", suffix=".uploading")
+    tmp_path = Path(tmp)
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            shutil.copyfileobj(file.stream if file else request.stream, tmp_file, 65536)
+
+        #内容与现有插件完全相同时不覆盖文件，也不触发插件重载
+        if save_path.exists() and file_hash(tmp_path, use_cache=False) == file_hash(save_path):
+            tmp_path.unlink()
+            return jsonify({"status": "unchanged"})
+        os.replace(tmp_path, save_path)
+    except OSError as e:
+        tmp_path.unlink(missing_ok=True)
+        return jsonify({"error": f"保存插件失败: {e}"}), 500
 
     try:
-        PluginManager.instance().reload_plugin(file.filename.replace(".py", ""))
+        PluginManager.instance().reload_plugin(save_path.stem)
         return jsonify({"status": "success"})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 # 下载插件接口
 #前端可通过点击下载按钮，将插件 .py 文件下载到本地。
+#send_from_directory 可走 sendfile 零拷贝，并按 ETag/If-Modified-Since 返回 304。
 @app.route("/download/<plugin_name>", methods=["GET"])
 def download_plugin(plugin_name):
     path = UPLOAD_FOLDER / f"{plugin_name}.py"
     if not path.exists():
         return jsonify({"error": f"插件文件不存在: {path}"}), 404
-    return send_file(str(path), as_attachment=True)
+    return send_from_directory(UPLOAD_FOLDER, path.name, as_attachment=True, conditional=True,
+                               etag=file_hash(path))
 
 
 # 插件回滚接口
@@ -68,35 +92,21 @@ def check_update(plugin_name):
     latest = get_latest_version(plugin_name)
     return jsonify({
         "update_available": compare_versions(version, latest),
-        "latest_version": latest
+        "latest_version": latest,
+        "download_url": f"/download/{plugin_name}"
     })
 
 #返回插件的绝对路径
 def get_plugin_path(plugin_name: str):
     return Path(__file__).resolve().parent.parent / "plugins" / f"{plugin_name}.py"
-#动态加载插件模块，并读取其类中的 __plugin_metadata__["version"]。
+#静态解析插件类中的 __plugin_metadata__["version"]（不执行插件代码，按 mtime/size 缓存）
 def get_latest_version(plugin_name: str):
-    plugin_path = get_plugin_path(plugin_name)
-    if not plugin_path.exists():
-        return "0.0.0"
+    return plugin_version(get_plugin_path(plugin_name))
+
+#服务启动时预热插件目录下全部插件的版本与哈希缓存，首批检查/下载请求不必现场解析和计算
+def warm_cache():
+    warm_plugin_caches(UPLOAD_FOLDER)
 
-    try:
-        import importlib.util
-        spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        metadata = getattr(module.Plugin, "__plugin_metadata__", {})
-        return metadata.get("version", "0.0.0")
-    except Exception:
-        return "0.0.0"
-
-def compare_versions(old: str, new: str):
-    return old != new
-
-#从 backups/<plugin_name>/ 中查找包含指定 version 的 .py 文件
-def find_backup(plugin_name: str, version: str) -> Path:
-    backups_dir = Path("backups") / plugin_name
-    return next((f for f in backups_dir.glob("*.py") if version in f.name), None)
 
 #将备份文件拷贝到插件目录，并调用 reload_plugin() 重加载使其生效
 def restore_backup(plugin_name, version):
@@ -0,0 +1,86 @@
+#插件版本工具
+# 静态解析插件文件中的 __plugin_metadata__["version"]，不执行插件代码。
+# 结果按 (st_mtime_ns, st_size) 缓存，文件未变化时不重复解析。
+# 版本比较和按版本查找备份也统一放在这里，各更新服务共用同一份实现。
+import ast
+import logging
+import re
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_version_cache: Dict[str, Tuple[Tuple[int, int], str]] = {}
+
+
+def read_metadata_version(plugin_path: Path) -> str:
+    """静态解析 __plugin_metadata__ 中的版本号，不执行插件代码"""
+    tree = ast.parse(Path(plugin_path).read_text(encoding="utf-8"), filename=str(plugin_path))
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Assign):
+            continue
+        if any(isinstance(t, ast.Name) and t.id == "__plugin_metadata__" for t in node.targets):
+            metadata = ast.literal_eval(node.value)
+            return metadata.get("version", "0.0.0")
+    return "0.0.0"
+
+
+def plugin_version(plugin_path) -> str:
+    """返回插件文件的版本号（按 mtime/size 缓存）；文件不存在或解析失败时返回 0.0.0"""
+    path = str(plugin_path)
+    try:
+        st = Path(path).stat()
+    except FileNotFoundError:
+        _version_cache.pop(path, None)
+        return "0.0.0"
+
+    key = (st.st_mtime_ns, st.st_size)
+    cached = _version_cache.get(path)
+    if cached and cached[0] == key:
+        return cached[1]
+
+    try:
+        version = read_metadata_version(path)
+    except (SyntaxError, ValueError, AttributeError) as e:
+        # 插件源码或元数据写错时记录下来，避免静默返回 0.0.0 掩盖问题
+        logger.warning("插件 %s 元数据解析失败: %s", path, e)
+        version = "0.0.0"
+    except OSError as e:
+        logger.warning("读取插件文件 %s 失败: %s", path, e)
+        version = "0.0.0"
+    _version_cache[path] = (key, version)
+    return version
+
+
+#按语义化版本逐段比较，仅当服务端版本更高时才提示更新
+@lru_cache(maxsize=512)
+def _parse_version(version: str) -> tuple:
+    """把 "1.10.0" / "v1_10_0" 解析为 (1, 10, 0)，按数值逐段比较"""
+    parts = re.split(r"[._]", version.strip().lstrip("vV"))
+    numbers = [int(p) if p.isdigit() else 0 for p in parts]
+    while numbers and numbers[-1] == 0:  # "1.0" 与 "1.0.0" 视为同一版本
+        numbers.pop()
+    return tuple(numbers)
+
+
+def compare_versions(old: str, new: str):
+    """new 比 old 更新时返回 True"""
+    return _parse_version(new) > _parse_version(old or "0.0.0")
+
+
+# 合法版本号：1.2.0 / v1_2_0 / 1.2.0-beta.1，不允许路径分隔符和 ".."
+_VERSION_RE = re.compile(r"[vV]?\d+(?:[._]\d+)*(?:[-+][0-9A-Za-z.]+)?")
+
+
+def find_backup(plugin_name: str, version: str, backup_root=Path("backups")) -> Optional[Path]:
+    """按 backups/<插件名>/<版本>.py 定位备份文件；版本号不合法或路径越出备份目录时返回 None"""
+    if not version or ".." in version or not _VERSION_RE.fullmatch(version):
+        return None
+    plugin_backup_dir = (Path(backup_root) / plugin_name).resolve()
+    if not plugin_backup_dir.is_relative_to(Path(backup_root).resolve()):
+        return None
+    backup_file = (plugin_backup_dir / f"{version}.py").resolve()
+    if not backup_file.is_relative_to(plugin_backup_dir) or not backup_file.is_file():
+        return None
+    return backup_file
@@ -37,7 +37,7 @@ from PyQt5.QtWidgets import QApplication
 from core.plugin_manager import PluginManager#插件的动态加载、卸载、热更新等
 from core.api_gateway import APIGateway#提供插件对外注册 API 的网关
 from ui.plugin_ui import PluginManagerUI#基于 PyQt5 的图形界面
-from core.update_server import app as update_server#Flask 应用（用于上传/下载/回滚等接口）
+from core.update_server import app as update_server, warm_cache#Flask 应用（用于上传/下载/回滚等接口）
 from core.service_bus import CoreServiceBus  # 总线服务导入
 
 # ✅ 初始化总线服务
@@ -47,6 +47,7 @@ from core.service_bus import CoreServiceBus  # 总线服务导入
 core_bus = CoreServiceBus()
 
 def run_update_server():
+    warm_cache()  # 在服务线程中预热版本与哈希缓存，不阻塞界面启动
     update_server.run(
         host='127.0.0.1',  # 明确设置为本地地址
         port=5000,
@@ -1,23 +1,38 @@
+import threading
+
+
 class Plugin:
     __plugin_metadata__ = {
         "name": "hello_plugin",
         "version": "1.0.0",
         "author": "MHX",
-        "allowed_apis": []
-        "model_name":""
+        "allowed_apis": [],
+        "model_name": ""
     }
 
     def __init__(self):
-        self._running = True
+        self._stop = threading.Event()
+        self._thread = None
 
     def hello(self, name):
         return f"你好，{name}！我是插件 hello_plugin！"
 
+    def start(self):
+        """在后台守护线程中运行插件循环"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, name="hello_plugin", daemon=True)
+        self._thread.start()
+
     def run(self):
-        import time
-        while self._running:
+        """插件主循环（阻塞），不能在 GUI 线程中直接调用，应由插件线程或 start() 调用"""
+        while not self._stop.is_set():
             print("[hello_plugin] 插件运行中...")
-            time.sleep(2)
+            self._stop.wait(2)
 
     def stop(self):
-        self._running = False
+        # Event.set 会立即唤醒 wait，停止不必等满一个周期
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=3)
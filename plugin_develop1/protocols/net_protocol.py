@@ -1,23 +1,32 @@
 # protocols/net_protocol.py
 import struct
-from dataclasses import dataclass
+from dataclasses import KW_ONLY, dataclass, field
 from typing import Any
 
+# 包头：4字节魔数 + 36字节插件ID + 1字节指令类型
+_HDR = struct.Struct("4s36sB")
 
-@dataclass
+
+@dataclass(slots=True)
 class PluginPacket:
     magic: bytes = b'\xA0\xB0\xC0\xD0'  # 4字节魔数
+    _: KW_ONLY  # 其余字段仅限关键字传参，字段顺序与包头布局保持一致
     plugin_id: str  # 36字节固定长度(对应uuid)
     cmd_type: int  # 1字节指令类型 0=数据 1=文件 2=控制
     data: bytes
+    _encoded_id: bytes = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # plugin_id 在包的生命周期内不变，编码一次后复用
+        pid = self.plugin_id.encode('utf-8')
+        self._encoded_id = pid if len(pid) == 36 else pid.ljust(36, b' ')[:36]
 
     def serialize(self) -> bytes:
-        encoded_id = self.plugin_id.ljust(36).encode('utf-8')
-        return self.magic + encoded_id + bytes([self.cmd_type]) + self.data
+        return _HDR.pack(self.magic, self._encoded_id, self.cmd_type) + self.data
 
     @classmethod
     def deserialize(cls, raw: bytes):
-        if len(raw) < 41:
+        if len(raw) < _HDR.size:
             raise ValueError("Invalid packet length")
         return cls(
             plugin_id=raw[4:40].decode('utf-8').rstrip(),
@@ -7,17 +7,28 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QTableWidget, QTableWidgetItem, QPushButton,
     QFileDialog, QMessageBox, QInputDialog, QHeaderView
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
+from functools import partial
 from pathlib import Path
+import requests
+
+HTTP_TIMEOUT = (3, 10)  # (连接超时, 读取超时) 秒，服务端无响应时不至于卡死界面
+UPLOAD_TIMEOUT = (3, 60)  # 上传大插件时读取超时放宽
 
 
 class PluginManagerUI(QWidget):
     #这个类继承自 QWidget，是一个完整的插件管理窗口界面类。
+    PAGE_SIZE = 50  # 表格每次渲染的行数，滚动到底部时再追加下一页
+
     def __init__(self, plugin_manager, core_bus):
         #初始化 UI 组件；调用 refresh_table() 动态填充插件列表数据
         super().__init__()
         self.pm = plugin_manager
         self.core_bus = core_bus
+        self._rows = []  # 当前刷新批次的插件快照 [(name, info), ...]
+        #复用同一个 HTTP 会话，保持与更新服务的长连接
+        self._session = requests.Session()
+        self._session.headers.update({'User-Agent': 'plugin-ui/1'})
         self._init_ui()
         self.refresh_table()
 
@@ -34,6 +45,7 @@ class PluginManagerUI(QWidget):
         self.table.setColumnCount(5)
         self.table.setHorizontalHeaderLabels(['插件名称', '版本', '状态', '操作', '日志'])
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.verticalScrollBar().valueChanged.connect(self._on_table_scrolled)
 
         #按钮控件
         #分别绑定了上传、下载、检查更新、调用服务四个操作。
@@ -70,14 +82,56 @@ class PluginManagerUI(QWidget):
                 QMessageBox.critical(self, "调用失败", str(e))
 
     #动态刷新插件表格
+    #只渲染第一页，其余行在滚动到底部时按页追加，插件很多时也不会卡住界面。
     def refresh_table(self):
-        self.table.setRowCount(len(self.pm.plugins))
+        self._batch_update(self._fill_table)
+        self._schedule_fill_viewport()
+
+    #刷新期间关闭重绘、排序和信号，全部单元格写完后只重新布局/绘制一次。
+    def _batch_update(self, fill):
+        sorting_enabled = self.table.isSortingEnabled()
+        self.table.setUpdatesEnabled(False)
+        self.table.setSortingEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            fill()
+        finally:
+            self.table.blockSignals(False)
+            self.table.setSortingEnabled(sorting_enabled)
+            self.table.setUpdatesEnabled(True)
+
+    def _fill_table(self):
+        self._rows = list(self.pm.plugins.items())
+        self.table.setRowCount(0)
+        self._append_rows()
+
+    #滚动条到达底部且还有未渲染的行时，追加下一页
+    def _on_table_scrolled(self, value: int):
+        if value == self.table.verticalScrollBar().maximum() and self.table.rowCount() < len(self._rows):
+            self._batch_update(self._append_rows)
+            self._schedule_fill_viewport()
+
+    #一页不足一屏时没有滚动条，也就不会触发滚动加载：继续追加直到出现滚动条或行已全部渲染。
+    #滚动条范围在表格重新布局后才更新，所以放到事件循环中下一轮再检查。
+    def _schedule_fill_viewport(self):
+        QTimer.singleShot(0, self._fill_viewport)
+
+    def _fill_viewport(self):
+        if self.table.verticalScrollBar().maximum() == 0 and self.table.rowCount() < len(self._rows):
+            self._batch_update(self._append_rows)
+            self._schedule_fill_viewport()
 
 #遍历所有插件，提取插件名、版本、状态、API权限；
 #使用 QTableWidgetItem 和 QPushButton 动态更新每一行；
 #根据插件状态设置颜色（运行中为绿色，停止为红色）；
 #每个插件一行，并生成“加载/卸载”按钮。
-        for row, (name, info) in enumerate(self.pm.plugins.items()):
+    def _append_rows(self):
+        start = self.table.rowCount()
+        end = min(start + self.PAGE_SIZE, len(self._rows))
+        self.table.setRowCount(end)
+
+        for row in range(start, end):
+            name, info = self._rows[row]
             version = self.pm.config['plugins'].get(name, {}).get('version', '未知')
             status = info['status']
             apis = self.pm.config['plugins'].get(name, {}).get('allowed_apis', [])
@@ -90,7 +144,7 @@ class PluginManagerUI(QWidget):
             self.table.setItem(row, 2, status_item)
 
             action_btn = QPushButton('卸载' if status == 'running' else '加载')
-            action_btn.clicked.connect(lambda _, n=name: self.toggle_plugin(n))
+            action_btn.clicked.connect(partial(self.toggle_plugin, name))
             self.table.setCellWidget(row, 3, action_btn)
 
             log_item = QTableWidgetItem(", ".join(apis) if apis else "无")
@@ -100,7 +154,8 @@ class PluginManagerUI(QWidget):
     #点击按钮时判断插件是否在运行；
     #运行中则调用_stop_plugin停止它，否则启动；
     #最后刷新表格。
-    def toggle_plugin(self, plugin_name: str):
+    #clicked 信号会附带 checked 参数，由 _checked 接收后忽略。
+    def toggle_plugin(self, plugin_name: str, _checked: bool = False):
         if self.pm.plugins[plugin_name]['status'] == 'running':
             self.pm._stop_plugin(plugin_name)
         else:
@@ -110,7 +165,7 @@ class PluginManagerUI(QWidget):
 
     #上传插件文件到服务器
     #打开文件选择对话框（只允许 .py 文件）；
-    # 使用 requests 向本地 Flask 服务发送 POST 请求上传文件；
+    # 使用共享的 requests 会话向本地 Flask 服务发送 POST 请求上传文件；
     #上传成功后弹出提示框。
     def upload_plugin(self):
         files, _ = QFileDialog.getOpenFileNames(
@@ -118,11 +173,16 @@ class PluginManagerUI(QWidget):
         )
         for file_path in files:
             try:
-                import requests
+                # 以原始字节流分块发送，不在内存中拼装 multipart 请求体
                 with open(file_path, 'rb') as f:
-                    response = requests.post(
+                    response = self._session.post(
                         'http://127.0.0.1:5000/upload',
-                        files={'file': (Path(file_path).name, f)}
+                        data=f,
+                        headers={
+                            'Content-Type': 'application/octet-stream',
+                            'X-Filename': Path(file_path).name
+                        },
+                        timeout=UPLOAD_TIMEOUT
                     )
                 if response.ok:
                     QMessageBox.information(self, '上传成功', f'插件 {Path(file_path).name} 已上传')
@@ -138,24 +198,26 @@ class PluginManagerUI(QWidget):
 
     #下载插件到本地
     #通过输入框输入插件名；
-    # 向Flask后端发GET请求下载插件源码；
+    # 向Flask后端发GET请求流式下载插件源码；
     #保存到用户指定路径；支持保存为.py文件。
     def download_plugin(self):
         plugin_name, ok = QInputDialog.getText(self, "下载插件", "输入插件名称:")
         if ok and plugin_name:
             try:
-                import requests
-                response = requests.get(f"http://127.0.0.1:5000/download/{plugin_name}")
-                if response.status_code == 200:
-                    save_path, _ = QFileDialog.getSaveFileName(
-                        self, "保存插件", f"{plugin_name}.py", "Python Files (*.py)"
-                    )
-                    if save_path:
-                        with open(save_path, "wb") as f:
-                            f.write(response.content)
-                        QMessageBox.information(self, "成功", f"插件 {plugin_name} 已保存")
-                else:
-                    QMessageBox.critical(self, "失败", f"下载失败: {response.json().get('error')}")
+                #流式下载，按块写入磁盘，不在内存中缓存整个文件
+                with self._session.get(f"http://127.0.0.1:5000/download/{plugin_name}",
+                                       stream=True, timeout=HTTP_TIMEOUT) as response:
+                    if response.status_code == 200:
+                        save_path, _ = QFileDialog.getSaveFileName(
+                            self, "保存插件", f"{plugin_name}.py", "Python Files (*.py)"
+                        )
+                        if save_path:
+                            with open(save_path, "wb") as f:
+                                for chunk in response.iter_content(65536):
+                                    f.write(chunk)
+                            QMessageBox.information(self, "成功", f"插件 {plugin_name} 已保存")
+                    else:
+                        QMessageBox.critical(self, "失败", f"下载失败: {response.json().get('error')}")
             except Exception as e:
                 QMessageBox.critical(self, "错误", str(e))
 
@@ -168,10 +230,9 @@ class PluginManagerUI(QWidget):
         plugin_name, ok = QInputDialog.getText(self, "检查插件更新", "输入插件名:")
         if ok and plugin_name:
             try:
-                import requests
                 version = self.pm.config['plugins'].get(plugin_name, {}).get("version", "0.0.0")
                 url = f"http://127.0.0.1:5000/check-update/{plugin_name}?version={version}"
-                res = requests.get(url)
+                res = self._session.get(url, timeout=HTTP_TIMEOUT)
 
                 if res.status_code != 200:
                     QMessageBox.warning(self, "请求失败", f"状态码：{res.status_code}\n响应内容：{res.text}")
@@ -1,26 +1,24 @@
-from flask import Flask, request, jsonify
-import hashlib
+from flask import Flask, request, jsonify, send_from_directory
 import shutil  # 添加shutil导入
 from pathlib import Path  # 添加Path导入
 from core.plugin_manager import PluginManager  # 导入插件管理器
+from core.cache_warmup import warm_plugin_caches
+from core.hash_utils import file_hash
+from core.version_utils import compare_versions, find_backup, plugin_version
 
 app = Flask(__name__)
+PLUGIN_DIR = Path(__file__).resolve().parent / "plugins"  # 与工作目录无关
 
 # 实现缺失的辅助函数
 def get_plugin_path(plugin_name: str) -> Path:
-    return Path("plugins") / f"{plugin_name}.py"
-
-def find_backup(plugin_name: str, version: str) -> Path:
-    backups_dir = Path("backups") / plugin_name
-    return next((f for f in backups_dir.glob("*.py") if version in f.name), None)
+    return PLUGIN_DIR / f"{plugin_name}.py"
 
 # 原有路由保持不变
 
-@app.route('/check-update/<plugin_name>')
+@app.route('/check-update/<plugin_name>', methods=["GET"])
 def check_update(plugin_name):
-    current_version = request.args.get('version')
+    current_version = request.args.get('version', '0.0.0')
     latest_version = get_latest_version(plugin_name)
-
     return jsonify({
         'update_available': compare_versions(current_version, latest_version),
         'latest_version': latest_version,
@@ -28,6 +26,18 @@ def check_update(plugin_name):
     })
 
 
+@app.route('/download/<plugin_name>', methods=["GET"])
+def download_plugin(plugin_name):
+    # send_from_directory 限定在插件目录内，可走 sendfile 零拷贝，并按 ETag/If-Modified-Since 返回 304
+    # ETag 使用内容哈希，内容未变的文件即使被重新写入也能命中客户端缓存
+    plugin_path = get_plugin_path(plugin_name)
+    if not plugin_path.exists():
+        return jsonify({"error": f"插件文件不存在: {plugin_path}"}), 404
+    return send_from_directory(plugin_path.parent.resolve(), plugin_path.name,
+                               as_attachment=True, conditional=True,
+                               etag=file_hash(plugin_path))
+
+
 @app.route('/rollback/<plugin_name>')
 def rollback(plugin_name):
     version = request.args.get('version')
@@ -37,15 +47,6 @@ def rollback(plugin_name):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@app.route('/check-update/<plugin_name>', methods=["GET"])
-def check_update(plugin_name):
-    version = request.args.get('version', '0.0.0')
-    latest = get_latest_version(plugin_name)
-    return jsonify({
-        "update_available": compare_versions(version, latest),
-        "latest_version": latest
-    })
-
 
 
 def restore_backup(plugin_name, version):
@@ -58,22 +59,17 @@ def restore_backup(plugin_name, version):
     PluginManager.instance().reload_plugin(plugin_name)
 
 def get_latest_version(plugin_name: str):
-    """从现有插件文件中提取版本"""
-    plugin_path = get_plugin_path(plugin_name)
-    if not plugin_path.exists():
-        return "0.0.0"
+    """从现有插件文件中提取版本（静态解析，按 mtime/size 缓存）"""
+    return plugin_version(get_plugin_path(plugin_name))
 
-    try:
-        spec = importlib.util.spec_from_file_location(plugin_name, plugin_path)
-        module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(module)
-        metadata = getattr(module.Plugin, "__plugin_metadata__", {})
-        return metadata.get("version", "0.0.0")
-    except Exception:
-        return "0.0.0"
+
+def warm_cache() -> None:
+    """预热路由所用插件文件的版本与哈希缓存，之后的检查/下载请求直接命中缓存"""
+    warm_plugin_caches(PLUGIN_DIR)
 
 
-def compare_versions(old: str, new: str):
-    """简单版本比较"""
-    return old != new
 
+if __name__ == "__main__":
+    # 服务启动时预热插件版本缓存（只在启动服务时执行，导入本模块不会启动线程池）
+    warm_cache()
+    app.run()
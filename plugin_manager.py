@@ -1,13 +1,17 @@
 import os
 import json
-import importlib
+import logging
+import functools
+import re
+import mmap
 import threading
 import shutil
 import hashlib
-import zipfile
-from datetime import datetime
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Callable, Tuple, Union
 
 from base_module import BaseModule
 from service_bus import PluginServiceBus, CoreServiceBus, ServiceBusError
@@ -15,9 +19,40 @@ from thread_executor import ThreadExecutor, DaemonTask
 from signal_manager import SignalManager
 from PyQt5.QtCore import pyqtSignal
 
+try:
+    # orjson 为可选依赖，解析/序列化 JSON 快数倍；json_dumps 统一返回 UTF-8 bytes
+    from orjson import loads as json_loads, dumps as json_dumps
+except ImportError:
+    json_loads = json.loads
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+try:
+    # blake3 为可选依赖：哈希只用于判断插件文件是否变化，不涉及安全，
+    # 用更快的 blake3 即可；未安装时回退到 sha256
+    from blake3 import blake3 as file_hasher
+except ImportError:
+    file_hasher = hashlib.sha256
+
+try:
+    import msgpack  # msgpack 为可选依赖，插件状态缓存用二进制格式存储，体积更小、加载更快
+except ImportError:
+    msgpack = None
+
 import sys
 sys.path.insert(0, os.getcwd())  # 确保当前目录在 sys.path 中
 
+logger = logging.getLogger(__name__)
+
+def with_registry_lock(func):
+    """在插件管理器的注册表锁内执行；RLock 可重入（load_plugin 内部会调用 unload_plugin）"""
+    @functools.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        with self._registry_lock:
+            return func(self, *args, **kwargs)
+    return wrapper
+
 class PluginManagerError(Exception):
     """插件管理器基础异常"""
     def __init__(self, code: int, message: str):
@@ -32,6 +67,43 @@ class PluginVersion:
         self.file_path = file_path
         self.hash = hash
         self.timestamp = timestamp
+        # 扫描阶段只记录文件信息，元数据在第一次加载时才解析
+        self.has_full_info = False
+        self.sort_key = version_key(version)  # 版本比较键，创建时解析一次
+
+def version_key(version: str) -> tuple:
+    """把 v1_0_0 / 1.0.0 这类版本号转成可比较的整数元组（v1_10_0 > v1_9_0）"""
+    return tuple(int(n) for n in re.findall(r"\d+", version))
+
+class PluginVersionSet:
+    """单个插件的所有版本，插入时维护最新版本，取最新版本为 O(1)"""
+    __slots__ = ('versions', 'latest')
+
+    def __init__(self):
+        self.versions: Dict[str, PluginVersion] = {}
+        self.latest: Optional[str] = None
+
+    def add(self, plugin_version: PluginVersion):
+        self.versions[plugin_version.version] = plugin_version
+        if self.latest is None or plugin_version.sort_key > self.versions[self.latest].sort_key:
+            self.latest = plugin_version.version
+
+    def discard(self, version: str):
+        """移除一个版本；移除的是最新版本时重新选出最新版本"""
+        if self.versions.pop(version, None) is not None and version == self.latest:
+            self.latest = max(self.versions.values(), key=lambda v: v.sort_key).version if self.versions else None
+
+    def get(self, version: str, default=None) -> Optional[PluginVersion]:
+        return self.versions.get(version, default)
+
+    def __contains__(self, version: str) -> bool:
+        return version in self.versions
+
+    def __iter__(self):
+        return iter(self.versions)
+
+    def __len__(self) -> int:
+        return len(self.versions)
 
 class PluginMetadata:
     """插件元数据容器"""
@@ -50,7 +122,8 @@ class PluginMetadata:
 class PluginInstance:
     """插件实例包装器"""
     def __init__(self, plugin_class: type, metadata: PluginMetadata, 
-                 thread_executor: ThreadExecutor):
+                 thread_executor: ThreadExecutor,
+                 on_status_changed: Optional[Callable[['PluginInstance'], None]] = None):
         self.plugin_class = plugin_class
         self.metadata = metadata
         self.instance = None
@@ -58,23 +131,34 @@ class PluginInstance:
         self.task_id = None
         self.status = "created"  # created, running, stopped, error
         self.error_message = ""
-        
+        self.on_status_changed = on_status_changed  # 状态变化回调，插件管理器据此更新状态快照
+        # 协作式停止：插件在 run() 循环中检查 stop_event，stop() 置位后插件自行退出
+        self.stop_event = threading.Event()
+        self._finished = threading.Event()  # _run_plugin 返回后置位，stop() 据此等待插件线程结束
+
+    def _set_status(self, status: str, error_message: str = ""):
+        """更新状态并通知插件管理器"""
+        self.status = status
+        self.error_message = error_message
+        if self.on_status_changed:
+            self.on_status_changed(self)
+
     def start(self, service_proxy: 'ServiceProxy'):
         """启动插件实例"""
         try:
-            # 创建插件实例
+            # 创建插件实例，插件通过 service_proxy.stop_event 感知停止请求
+            service_proxy.stop_event = self.stop_event
             self.instance = self.plugin_class(service_proxy)
-            
+
+            # 先置为 running 再提交任务，避免插件很快结束时 stopped 被 running 覆盖
+            self._set_status("running")
             # 在独立线程中运行插件
             self.task_id = self.thread_executor.submit(
                 fn=self._run_plugin,
                 pool_name="qt_default"
             )
-            
-            self.status = "running"
         except Exception as e:
-            self.status = "error"
-            self.error_message = str(e)
+            self._set_status("error", str(e))
             raise PluginManagerError(500, f"插件启动失败: {str(e)}")
     
     def _run_plugin(self):
@@ -84,23 +168,25 @@ class PluginInstance:
                 self.instance.run()
             elif hasattr(self.instance, 'start'):
                 self.instance.start()
-            self.status = "stopped"
+            self._set_status("stopped")
         except Exception as e:
-            self.status = "error"
-            self.error_message = str(e)
-    
-    def stop(self):
-        """停止插件实例"""
+            self._set_status("error", str(e))
+        finally:
+            self._finished.set()
+
+    def stop(self, timeout: float = 3.0):
+        """停止插件实例：先通知插件自行退出，超时仍未结束再尝试取消任务"""
+        self.stop_event.set()
         if self.instance and hasattr(self.instance, 'stop'):
             try:
                 self.instance.stop()
             except Exception:
                 pass
-        self.status = "stopped"
-        
-        # 取消插件线程
-        if self.task_id:
+
+        # 等待插件线程退出（未运行过的任务不等待）
+        if self.task_id and not self._finished.wait(timeout):
             self.thread_executor.cancel_task(self.task_id)
+        self._set_status("stopped")
 
 class ServiceProxy:
     """服务总线代理，实现权限控制"""
@@ -109,12 +195,21 @@ class ServiceProxy:
         self.plugin_name = plugin_name
         self.core_bus = core_bus
         self.allowed_services = allowed_services
+        self._allowed = frozenset(allowed_services)  # 权限检查 O(1)
+        self._service_cache: Dict[str, Any] = {}     # 已解析的服务实例，避免每次调用都经过核心总线
+        self.stop_event: Optional[threading.Event] = None  # 由 PluginInstance.start 绑定
     
     def get_service(self, service_name: str) -> Any:
         """获取服务（带权限检查）"""
-        if service_name not in self.allowed_services:
+        service = self._service_cache.get(service_name)
+        if service is not None:
+            return service
+        if service_name not in self._allowed:
             raise PermissionError(f"插件 '{self.plugin_name}' 无权限访问服务 '{service_name}'")
-        return self.core_bus.get_service(service_name)
+        service = self.core_bus.get_service(service_name)
+        if service is not None:
+            self._service_cache[service_name] = service
+        return service
 
 class PluginManager(BaseModule):
     """插件管理系统
@@ -125,7 +220,7 @@ class PluginManager(BaseModule):
         │       ├── v1_0_0/
         │       │   ├── plugin.py
         │       │   └── metadata.json
-        │       └── current -> v1_0_0/（符号链接）
+        │       └── current.txt          # 当前版本指针，内容为 v1_0_0
         ├── update_plugins/          # 待更新的插件(zip格式)
         │   └── example_plugin_v1_1_0.zip
         └── rollback_plugins/        # 已回滚的插件(zip格式)
@@ -135,10 +230,15 @@ class PluginManager(BaseModule):
     plugin_loaded = pyqtSignal(str, str)  # (插件名, 版本)
     plugin_unloaded = pyqtSignal(str)     # 插件名
     plugin_updated = pyqtSignal(str, str, str)  # (插件名, 旧版本, 新版本)
+    plugins_bulk_loaded = pyqtSignal(list)  # load_all 完成后一次性发出 [(插件名, 版本), ...]
+
+    PARALLEL_EXTRACT_SIZE = 10 * 1024 * 1024  # 更新包超过 10MB 时多线程解压
+    MMAP_HASH_MIN = 64 * 1024  # 小于 64KB 的文件一次 read 即可，建立映射的开销反而更大
+    MMAP_HASH_LIMIT = 64 * 1024 * 1024  # 不超过 64MB 的文件用 mmap 计算哈希
     
     def __init__(self, core_bus: CoreServiceBus, plugin_bus: PluginServiceBus):
         super().__init__()
-        print("插件管理器初始化")
+        logger.debug("插件管理器初始化")
         self.core_bus = core_bus
         self.plugin_bus = plugin_bus
         
@@ -147,11 +247,19 @@ class PluginManager(BaseModule):
         self.signal_manager = core_bus.get_service("signal")
         
         # 插件注册表
-        self.plugin_registry: Dict[str, Dict[str, PluginVersion]] = {}
+        self.plugin_registry: Dict[str, PluginVersionSet] = {}
         # 活动插件
         self.active_plugins: Dict[str, PluginInstance] = {}
-        # 插件元数据缓存
-        self.metadata_cache: Dict[str, PluginMetadata] = {}
+        # 注册表/活动插件的写操作都在此锁内进行；读路径使用写时复制的快照，无需加锁
+        self._registry_lock = threading.RLock()
+        # 已执行的插件模块 {(插件名, 版本, 文件哈希): module}
+        self._module_cache: Dict[Tuple[str, str, str], Any] = {}
+        # 插件状态快照（写时复制）：状态变化时整体替换，读方拿到的是只读视图，不需要加锁也不会被并发修改
+        self._status_lock = threading.Lock()
+        self._status_snapshot: Dict[str, Dict[str, Any]] = {}
+        self._status_view = MappingProxyType(self._status_snapshot)
+        # 插件元数据缓存 {(插件名, 版本): ((mtime_ns, size), 元数据)}
+        self.metadata_cache: Dict[Tuple[str, str], Tuple[tuple, PluginMetadata]] = {}
         
         # 插件根目录
         self.PLUGIN_ROOT       = Path(os.getcwd()) / "plugins"
@@ -163,13 +271,18 @@ class PluginManager(BaseModule):
         # 确保目录存在
         for p in (self.USING_PLUGINS, self.UPDATE_PLUGINS, self.ROLLBACK_PLUGINS):
             p.mkdir(parents=True, exist_ok=True)
+
+        # 持久化的文件状态缓存 {文件路径: [mtime_ns, size, 文件哈希, 解析后的元数据]}
+        # 文件 (mtime, size) 未变化时直接复用哈希/元数据，不再读文件
+        self._cache_path = self.PLUGIN_ROOT / (".plugin_cache.msgpack" if msgpack else ".plugin_cache.json")
+        self._stat_cache: Dict[str, list] = self._load_stat_cache()
+        self._stat_cache_dirty = False
+        self._stat_cache_lock = threading.Lock()  # load_all/discover_plugins 会从多个线程写入缓存
         
         # 注册信号
         self._register_signals()
     
-    @property
-    def module_name(self) -> str:
-        return "plugin_manager"
+    module_name = "plugin_manager"
     
     def _register_signals(self):
         """注册内部信号"""
@@ -177,40 +290,64 @@ class PluginManager(BaseModule):
         self.signal_manager.register_regular_signal("plugin_manager", "plugin_unloaded", str)
 
     def discover_plugins(self):
-        """扫描 using_plugins 目录，构建注册表"""
-        print("扫描插件目录...")
-        self.plugin_registry.clear()
-
-        for plugin_dir in self.USING_PLUGINS.iterdir():
-            if not plugin_dir.is_dir():
-                continue
-            plugin_name = plugin_dir.name
-            versions_dir = plugin_dir  # using_plugins/example_plugin/v1_0_0
-            self.plugin_registry[plugin_name] = {}
-
-            for version_dir in versions_dir.iterdir():
-                if not version_dir.is_dir():
-                    continue
-                version = version_dir.name
-                plugin_file = version_dir / "plugin.py"
-                if plugin_file.exists():
-                    file_hash = self._calculate_file_hash(plugin_file)
-                    self.plugin_registry[plugin_name][version] = PluginVersion(
-                        version=version,
-                        file_path=str(plugin_file),
-                        hash=file_hash,
-                        timestamp=plugin_file.stat().st_mtime
-                    )
-        print(f"发现 {len(self.plugin_registry)} 个插件")
-    
-    def load_plugin(self, plugin_name: str, version: str):
-        """从 using_plugins 中加载指定版本"""
-        if plugin_name not in self.plugin_registry or version not in self.plugin_registry[plugin_name]:
+        """扫描 using_plugins 目录，构建注册表（各版本的 stat + 哈希并行计算）"""
+        logger.debug("扫描插件目录...")
+        # scandir 的 DirEntry 自带文件类型，不用为每个条目再 stat 一次
+        with os.scandir(self.USING_PLUGINS) as it:
+            plugin_entries = [entry for entry in it if entry.is_dir()]
+
+        # 先在当前线程列出所有版本目录，再按版本分发到线程池：
+        # 单个插件有很多版本时同样能并行，哈希计算在 hashlib 内部释放 GIL
+        registry: Dict[str, PluginVersionSet] = {entry.name: PluginVersionSet() for entry in plugin_entries}
+        items = []
+        for entry in plugin_entries:
+            with os.scandir(entry.path) as it:  # using_plugins/example_plugin/v1_0_0
+                items.extend((entry.name, v.name, v.path) for v in it if v.is_dir())
+
+        if items:
+            workers = min(32, (os.cpu_count() or 1) * 4, len(items))
+            with ThreadPoolExecutor(max_workers=workers) as ex:
+                # 结果在当前线程汇总，工作线程之间不共享可变状态
+                for plugin_name, plugin_version in ex.map(self._scan_one_version, items):
+                    if plugin_version is not None:
+                        registry[plugin_name].add(plugin_version)
+
+        with self._registry_lock:
+            self.plugin_registry.clear()
+            self.plugin_registry.update(registry)
+        # 扫描结束即写回缓存，进程异常退出也不会丢掉本次算好的哈希
+        self._save_stat_cache()
+        logger.info("发现 %d 个插件", len(self.plugin_registry))
+
+    def _scan_one_version(self, item: Tuple[str, str, str]) -> Tuple[str, Optional[PluginVersion]]:
+        """读取单个版本目录的 plugin.py 信息（在线程池中执行），没有 plugin.py 时返回 None"""
+        plugin_name, version, version_dir = item
+        # 扫描路径全程用字符串拼接，不为每个文件构造 Path 对象
+        plugin_file = os.path.join(version_dir, "plugin.py")
+        try:
+            st = os.stat(plugin_file)  # 一次 stat 同时用于存在判断、时间戳和哈希缓存
+        except OSError:  # 不存在、无权限或扫描期间被删除，都当作该版本不可用
+            return plugin_name, None
+        return plugin_name, PluginVersion(
+            version=version,
+            file_path=plugin_file,
+            hash=self._calculate_file_hash(plugin_file, st),
+            timestamp=st.st_mtime
+        )
+
+    def load_plugin(self, plugin_name: str, version: str, batch: bool = False):
+        """从 using_plugins 中加载指定版本
+        :param batch: 批量加载时为 True，不在工作线程中发加载信号，由调用方在全部完成后逐个补发
+        """
+        version = self._resolve_version(plugin_name, version)
+        if version not in self.plugin_registry.get(plugin_name, ()):
             raise PluginManagerError(404, f"插件 {plugin_name} 版本 {version} 未找到")
 
-        if plugin_name in self.active_plugins:
-            self.unload_plugin(plugin_name)
+        with self._registry_lock:
+            if plugin_name in self.active_plugins:
+                self.unload_plugin(plugin_name)
 
+        # 读元数据、导入模块是耗时部分，放在锁外，便于 load_all 并行加载
         metadata = self._load_metadata(plugin_name, version)
         service_proxy = ServiceProxy(
             plugin_name=plugin_name,
@@ -218,52 +355,106 @@ class PluginManager(BaseModule):
             allowed_services=metadata.required_services
         )
         plugin_class = self._import_plugin(plugin_name, version, metadata.entry_point)
-        plugin_instance = PluginInstance(
-            plugin_class=plugin_class,
-            metadata=metadata,
-            thread_executor=self.thread_executor
-        )
-        plugin_instance.start(service_proxy)
-        self.active_plugins[plugin_name] = plugin_instance
 
+        with self._registry_lock:
+            if plugin_name in self.active_plugins:  # 导入期间被其他线程抢先加载
+                self.unload_plugin(plugin_name)
+
+            plugin_instance = PluginInstance(
+                plugin_class=plugin_class,
+                metadata=metadata,
+                thread_executor=self.thread_executor,
+                on_status_changed=functools.partial(self._update_status, plugin_name)
+            )
+            plugin_instance.start(service_proxy)
+            self.active_plugins[plugin_name] = plugin_instance
+            self._update_status(plugin_name, plugin_instance)
+
+        if not batch:
+            self._emit_plugin_loaded(plugin_name, version)
+        logger.info("插件 '%s' v%s 加载成功", plugin_name, version)
+
+    def load_all(self) -> List[Tuple[str, str]]:
+        """并行加载注册表中每个插件的最新版本，返回加载成功的 (插件名, 版本) 列表"""
+        targets = [(name, versions.latest)
+                   for name, versions in list(self.plugin_registry.items()) if versions]
+        loaded: List[Tuple[str, str]] = []
+        if not targets:
+            return loaded
+
+        with ThreadPoolExecutor(max_workers=min(8, len(targets))) as ex:
+            futures = {ex.submit(self.load_plugin, name, version, True): (name, version)
+                       for name, version in targets}
+            for future in as_completed(futures):
+                name, version = futures[future]
+                try:
+                    future.result()
+                    loaded.append((name, version))
+                except Exception as e:
+                    logger.warning("加载插件 %s v%s 失败: %s", name, version, e)
+
+        # 全部加载完成后在调用线程中逐个发出单插件信号，已有的 plugin_loaded 监听者照常收到通知；
+        # 需要汇总结果的监听者只接 plugins_bulk_loaded 即可
+        for name, version in loaded:
+            self._emit_plugin_loaded(name, version)
+        self.plugins_bulk_loaded.emit(loaded)
+        return loaded
+
+    def _emit_plugin_loaded(self, plugin_name: str, version: str):
+        """发出单个插件加载完成的信号（本对象信号 + 信号管理器中的 plugin_loaded）"""
         self.plugin_loaded.emit(plugin_name, version)
         self.signal_manager.emit_regular_signal("plugin_manager", "plugin_loaded", plugin_name, version)
-        print(f"插件 '{plugin_name}' v{version} 加载成功")
-    
+
+    @with_registry_lock
     def unload_plugin(self, plugin_name: str):
         if plugin_name not in self.active_plugins:
             raise PluginManagerError(404, f"插件 '{plugin_name}' 未加载")
         instance = self.active_plugins[plugin_name]
         instance.stop()
         del self.active_plugins[plugin_name]
+        # 模块保留在 sys.modules 和模块缓存中，卸载后再次加载同一版本不必重新执行插件源码；
+        # 版本目录被删除（更新/回滚后清理）时由 _forget_version 统一移除
+        self._remove_status(plugin_name)
         self.plugin_unloaded.emit(plugin_name)
         self.signal_manager.emit_regular_signal("plugin_manager", "plugin_unloaded", plugin_name)
-        print(f"插件 '{plugin_name}' 已卸载")
+        logger.info("插件 '%s' 已卸载", plugin_name)
     
-    def get_plugin_status(self, plugin_name: str) -> Dict[str, Any]:
-        """获取插件状态"""
-        if plugin_name not in self.active_plugins:
-            return {"status": "not_loaded"}
-
-        instance = self.active_plugins[plugin_name]
-        return {
+    def _update_status(self, plugin_name: str, instance: PluginInstance):
+        """插件状态变化时只重建该插件的条目（可能在插件线程中调用）"""
+        if self.active_plugins.get(plugin_name) is not instance:
+            return  # 已卸载或已被新实例替换的旧实例，忽略
+        entry = {
             "status": instance.status,                # created / running / stopped / error
             "version": instance.metadata.version,     # 当前版本
             "task_id": instance.task_id,              # 线程任务 id
             "error": instance.error_message           # 若出错，错误文本
         }
-    
-    def get_loaded_plugins(self) -> Dict[str, Dict[str, Any]]:
-        """获取所有已加载插件的状态"""
-        loaded_plugins = {}
-        for plugin_name, instance in self.active_plugins.items():
-            loaded_plugins[plugin_name] = self.get_plugin_status(plugin_name)
-        print("已加载插件状态:", loaded_plugins)
-        return loaded_plugins
+        with self._status_lock:
+            snapshot = dict(self._status_snapshot)
+            snapshot[plugin_name] = entry
+            self._status_snapshot = snapshot
+            self._status_view = MappingProxyType(snapshot)
+
+    def _remove_status(self, plugin_name: str):
+        """插件卸载后从状态快照中移除"""
+        with self._status_lock:
+            snapshot = dict(self._status_snapshot)
+            snapshot.pop(plugin_name, None)
+            self._status_snapshot = snapshot
+            self._status_view = MappingProxyType(snapshot)
+
+    def get_plugin_status(self, plugin_name: str) -> Dict[str, Any]:
+        """获取插件状态"""
+        return self._status_snapshot.get(plugin_name, {"status": "not_loaded"})
+
+    def get_loaded_plugins(self) -> Mapping[str, Dict[str, Any]]:
+        """获取所有已加载插件的状态（只读视图，不复制）"""
+        return self._status_view
 
+    @with_registry_lock
     def update_plugin(self, plugin_name: str, new_zip_path: str):
         """手动更新插件：从 update_plugins 读取 zip,解压到 using_plugins,旧版打包到 rollback_plugins"""
-        print(f"更新插件: {plugin_name}")
+        logger.info("更新插件: %s", plugin_name)
         if plugin_name in self.active_plugins:
             old_version = self.active_plugins[plugin_name].metadata.version
             self.unload_plugin(plugin_name)
@@ -281,11 +472,12 @@ class PluginManager(BaseModule):
         self.load_plugin(plugin_name, new_version)
         self._cleanup_old_versions(plugin_name, new_version)
         self.plugin_updated.emit(plugin_name, old_version, new_version)
-        print(f"插件 '{plugin_name}' 已从 {old_version} 更新到 {new_version}")
+        logger.info("插件 '%s' 已从 %s 更新到 %s", plugin_name, old_version, new_version)
     
+    @with_registry_lock
     def rollback_plugin(self, plugin_name: str, target_version: str):
         """手动回滚插件：从 rollback_plugins 选择 zip，解压覆盖 using_plugins"""
-        print(f"回滚插件: {plugin_name} 到 {target_version}")
+        logger.info("回滚插件: %s 到 %s", plugin_name, target_version)
         if plugin_name in self.active_plugins:
             current_version = self.active_plugins[plugin_name].metadata.version
             self.unload_plugin(plugin_name)
@@ -300,20 +492,25 @@ class PluginManager(BaseModule):
             raise PluginManagerError(404, f"回滚版本 {target_version} 未找到")
         rollback_zip = matches[-1]  # 选最新备份
 
-        # 解压覆盖
+        # 解压覆盖：整个插件目录会被替换，先丢弃它现有各版本的注册信息和缓存
         using_dir = self.USING_PLUGINS / plugin_name
+        for version in list(self.plugin_registry.get(plugin_name, ())):
+            self._forget_version(plugin_name, version)
         if using_dir.exists():
             shutil.rmtree(using_dir)
         using_dir.mkdir(parents=True, exist_ok=True)
 
+        import zipfile  # 只在更新/回滚时用到，延迟导入以缩短启动时间
         with zipfile.ZipFile(rollback_zip, 'r') as zf:
             zf.extractall(using_dir)
+        self._precompile(using_dir / target_version)
+        self._set_current_link(using_dir, target_version)
 
-        # 重新扫描并加载
-        self.discover_plugins()
+        # 登记回滚后的版本并加载
+        self._register_version(plugin_name, using_dir / target_version)
         self.load_plugin(plugin_name, target_version)
         self._cleanup_old_versions(plugin_name, target_version)
-        print(f"插件 '{plugin_name}' 已回滚到 {target_version}")
+        logger.info("插件 '%s' 已回滚到 %s", plugin_name, target_version)
 
     def _backup_plugin(self, plugin_name: str, version: str):
         """把 using_plugins 中的旧版本打包成 zip 存入 rollback_plugins"""
@@ -322,10 +519,15 @@ class PluginManager(BaseModule):
             return
         backup_name = f"{plugin_name}_{version}.zip"
         backup_path = self.ROLLBACK_PLUGINS / backup_name
-        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED) as zf:
+        # 插件目录基本是小文本文件，压缩级别 1 比默认的 6 快数倍而体积相差不大；
+        # __pycache__ 可在导入时重新生成，不打进备份
+        import zipfile
+        with zipfile.ZipFile(backup_path, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
             for file in src_dir.rglob("*"):
+                if "__pycache__" in file.parts:
+                    continue
                 zf.write(file, file.relative_to(src_dir.parent))
-        print(f"已创建备份: {backup_path}")
+        logger.info("已创建备份: %s", backup_path)
 
     def _install_plugin_version(self, plugin_name: str, zip_path: str) -> str:
         """把 update_plugins 中的 zip 解压到 using_plugins"""
@@ -333,62 +535,140 @@ class PluginManager(BaseModule):
         if not zip_path.exists():
             raise PluginManagerError(404, f"更新包 {zip_path} 不存在")
 
-        # 读取元数据取得版本号
-        with zipfile.ZipFile(zip_path, 'r') as zf:
-            with zf.open("metadata.json") as mf:
-                metadata = json.load(mf)
-                version = metadata.get("version")
-                if not version:
-                    raise PluginManagerError(500, "元数据中缺少版本号")
-
-        # 清空并解压
-        target_dir = self.USING_PLUGINS / plugin_name / version
-        if target_dir.exists():
-            shutil.rmtree(target_dir)
-        target_dir.mkdir(parents=True, exist_ok=True)
-
+        import zipfile
+        # 只打开一次：读取元数据取得版本号后直接解压
         with zipfile.ZipFile(zip_path, 'r') as zf:
-            zf.extractall(target_dir)
-
-        # 更新符号链接
-        current_link = self.USING_PLUGINS / plugin_name / "current"
-        self._set_current_link(current_link, target_dir)
-
-        # 重新扫描
-        self.discover_plugins()
+            # 中央目录只取一次，读元数据和解压都直接使用 ZipInfo，省去按文件名查找
+            infos = zf.infolist()
+            meta_info = next((i for i in infos if i.filename == "metadata.json"), None)
+            if meta_info is None:
+                raise PluginManagerError(500, "更新包中缺少 metadata.json")
+            metadata = json_loads(zf.read(meta_info))
+            version = metadata.get("version")
+            if not version:
+                raise PluginManagerError(500, "元数据中缺少版本号")
+
+            # 清空并解压
+            target_dir = self.USING_PLUGINS / plugin_name / version
+            if target_dir.exists():
+                shutil.rmtree(target_dir)
+            target_dir.mkdir(parents=True, exist_ok=True)
+
+            if zip_path.stat().st_size > self.PARALLEL_EXTRACT_SIZE:
+                self._parallel_extract(zip_path, infos, target_dir)
+            else:
+                zf.extractall(target_dir, members=infos)
+
+        self._precompile(target_dir)
+        # 更新 current 指针
+        self._set_current_link(self.USING_PLUGINS / plugin_name, version)
+
+        # 只登记新安装的这一个版本，不重新扫描整个插件根目录
+        self._register_version(plugin_name, target_dir)
         return version
 
-    def _set_current_link(self, link_path: Path, target_dir: Path):
-        """跨平台设置 current -> version 符号链接（Windows 用 junction）"""
-        if link_path.exists() or link_path.is_symlink():
-            link_path.unlink()
-        if os.name == 'nt':
-            import _winapi
-            _winapi.CreateJunction(str(target_dir), str(link_path))
-        else:
-            link_path.symlink_to(target_dir)    
-    
+    def _parallel_extract(self, zip_path: Path, members: List['zipfile.ZipInfo'], target_dir: Path):
+        """大更新包多线程解压；ZipFile 句柄不是线程安全的，每个线程各自打开一份"""
+        import zipfile
+        workers = min(os.cpu_count() or 4, 8)
+        chunks = [members[i::workers] for i in range(workers)]
+
+        # 先在主线程建好所有目录，避免多个线程同时 makedirs 同一目录时报 FileExistsError
+        # 条目路径先解析再校验，拒绝 "../" 或绝对路径等指向目标目录之外的条目（zip slip）
+        root = target_dir.resolve()
+        paths = []
+        for info in members:
+            member_path = (root / info.filename).resolve()
+            if not member_path.is_relative_to(root):
+                raise PluginManagerError(500, f"更新包条目路径非法: {info.filename}")
+            paths.append(member_path if info.is_dir() else member_path.parent)
+        for path in paths:
+            path.mkdir(parents=True, exist_ok=True)
+
+        def extract_chunk(chunk: List['zipfile.ZipInfo']):
+            with zipfile.ZipFile(zip_path, 'r') as zf:
+                for info in chunk:
+                    zf.extract(info, target_dir)
+
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            # list() 让工作线程中的异常在这里抛出
+            list(ex.map(extract_chunk, [c for c in chunks if c]))
+
+    def _precompile(self, version_dir: Path):
+        """安装后立即把插件源码编译成 __pycache__ 下的 .pyc，首次加载时 SourceFileLoader 直接读取字节码"""
+        import compileall
+        if not compileall.compile_dir(str(version_dir), quiet=1):
+            # 编译失败不影响安装，真正加载时会给出具体的语法错误
+            logger.warning("插件目录 %s 预编译失败", version_dir)
+
+    def _set_current_link(self, plugin_dir: Path, version: str):
+        """设置当前版本指针：写入 current.txt（临时文件 + os.replace 原子替换，跨平台且无需创建符号链接/junction）"""
+        # 清理旧版本遗留的 current 符号链接 / junction（只删除链接本身，不影响目标目录）
+        legacy_link = plugin_dir / "current"
+        if legacy_link.is_symlink():
+            legacy_link.unlink()
+        elif os.name == 'nt' and legacy_link.is_dir():
+            os.rmdir(legacy_link)
+
+        tmp_path = plugin_dir / ".current.tmp"
+        tmp_path.write_text(version, encoding='utf-8')
+        os.replace(tmp_path, plugin_dir / "current.txt")
+
+    def _resolve_version(self, plugin_name: str, version: str) -> str:
+        """version 为 "latest" 时取注册表中的最新版本，为 "current" 时从 current.txt 读取实际版本号"""
+        if version == "latest":
+            versions = self.plugin_registry.get(plugin_name)
+            if not versions:
+                raise PluginManagerError(404, f"插件 {plugin_name} 未找到")
+            return versions.latest
+        if version != "current":
+            return version
+        pointer = self.USING_PLUGINS / plugin_name / "current.txt"
+        try:
+            return pointer.read_text(encoding='utf-8').strip()
+        except FileNotFoundError:
+            raise PluginManagerError(404, f"插件 '{plugin_name}' 未设置当前版本")
+
     def _import_plugin(self, plugin_name: str, version: str, entry_point: str) -> type:
         """使用文件路径动态导入插件模块"""
+        version = self._resolve_version(plugin_name, version)
         # 获取插件文件路径
         file_path = self.USING_PLUGINS / plugin_name / version / "plugin.py"
         
-        if not file_path.exists():
+        try:
+            st = file_path.stat()  # 存在判断与哈希缓存共用同一次 stat
+        except FileNotFoundError:
             raise PluginManagerError(404, f"插件文件未找到: {file_path}")
         
         # 创建唯一的模块名
-        module_name = f"plugins_{plugin_name}_{version.replace('.', '_')}"
-        
+        module_name = self._module_name(plugin_name, version)
+
+        # 同一版本且文件内容未变时复用已执行过的模块，跳过编译和 exec_module
+        # （哈希走 stat 缓存，文件未改动时不会重新读取）
+        cache_key = (plugin_name, version, self._calculate_file_hash(file_path, st))
+
         try:
-            # 使用 importlib 从文件路径加载模块
-            spec = importlib.util.spec_from_file_location(module_name, file_path)
-            if spec is None:
-                raise PluginManagerError(500, f"无法创建模块规范: {file_path}")
-            
-            module = importlib.util.module_from_spec(spec)
-            sys.modules[module_name] = module
-            spec.loader.exec_module(module)
-            
+            module = self._module_cache.get(cache_key)
+            if module is None:
+                import importlib.util  # 顶层只 import importlib 不保证 importlib.util 已加载
+                # 使用 importlib 从文件路径加载模块
+                spec = importlib.util.spec_from_file_location(module_name, file_path)
+                if spec is None:
+                    raise PluginManagerError(500, f"无法创建模块规范: {file_path}")
+
+                module = importlib.util.module_from_spec(spec)
+                sys.modules[module_name] = module
+                spec.loader.exec_module(module)
+
+                # 同一 (插件, 版本) 只保留最新内容对应的模块；load_all 会从多个线程并发进入，
+                # 淘汰与写入放在注册表锁内，避免遍历时字典被其他线程修改
+                with self._registry_lock:
+                    for key in [k for k in self._module_cache if k[:2] == cache_key[:2]]:
+                        del self._module_cache[key]
+                    self._module_cache[cache_key] = module
+            else:
+                sys.modules[module_name] = module
+
             # 获取入口类
             if not hasattr(module, entry_point):
                 raise PluginManagerError(500, f"入口点 '{entry_point}' 未找到")
@@ -397,72 +677,212 @@ class PluginManager(BaseModule):
         except Exception as e:
             raise PluginManagerError(500, f"插件导入失败: {str(e)}")
     
+    @staticmethod
+    def _module_name(plugin_name: str, version: str) -> str:
+        """插件模块在 sys.modules 中的名称"""
+        return f"plugins_{plugin_name}_{version.replace('.', '_')}"
+
     def _load_metadata(self, plugin_name: str, version: str) -> PluginMetadata:
-        """加载插件元数据"""
-        # 检查缓存
-        if plugin_name in self.metadata_cache:
-            return self.metadata_cache[plugin_name]
-        
+        """加载插件元数据（按 (插件名, 版本) 缓存，metadata.json 变化后自动失效）"""
+        version = self._resolve_version(plugin_name, version)
         # 元数据文件路径
         metadata_file = self.USING_PLUGINS / plugin_name / version / "metadata.json"
-        
-        if not metadata_file.exists():
+        try:
+            st = metadata_file.stat()
+        except FileNotFoundError:
             raise PluginManagerError(404, f"插件 '{plugin_name}' 元数据文件未找到")
-        
+
+        # 检查缓存
+        cache_key = (plugin_name, version)
+        stat_key = (st.st_mtime_ns, st.st_size)
+        cached = self.metadata_cache.get(cache_key)
+        if cached and cached[0] == stat_key:
+            return cached[1]
+
         try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                metadata = PluginMetadata(
-                    name=data.get("name", plugin_name),
-                    author=data.get("author", "未知作者"),
-                    description=data.get("description", ""),
-                    entry_point=data.get("entry_point", "Plugin"),
-                    min_system_version=data.get("min_system_version"),
-                    required_services=data.get("required_services", []),
-                    permissions=data.get("permissions", []),
-                    version=data.get("version")
-                )
-                
-                # 缓存元数据
-                self.metadata_cache[plugin_name] = metadata
-                return metadata
+            data = self._read_metadata_file(metadata_file, st)
         except json.JSONDecodeError as e:
             raise PluginManagerError(500, f"元数据解析失败: {str(e)}")
-    
+
+        metadata = PluginMetadata(
+            name=data.get("name", plugin_name),
+            author=data.get("author", "未知作者"),
+            description=data.get("description", ""),
+            entry_point=data.get("entry_point", "Plugin"),
+            min_system_version=data.get("min_system_version"),
+            required_services=data.get("required_services", []),
+            permissions=data.get("permissions", []),
+            version=data.get("version")
+        )
+
+        # 缓存元数据
+        self.metadata_cache[cache_key] = (stat_key, metadata)
+        versions = self.plugin_registry.get(plugin_name)
+        plugin_version = versions.get(version) if versions else None
+        if plugin_version:
+            plugin_version.has_full_info = True
+        return metadata
+
+    def _read_metadata_file(self, metadata_file: Path, st: os.stat_result) -> dict:
+        """读取 metadata.json，文件未变化时直接返回持久化缓存中的解析结果"""
+        entry = self._stat_cache.get(str(metadata_file))
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size and entry[3] is not None:
+            return entry[3]
+
+        data = json_loads(metadata_file.read_bytes())
+        with self._stat_cache_lock:
+            self._stat_cache[str(metadata_file)] = [st.st_mtime_ns, st.st_size, None, data]
+            self._stat_cache_dirty = True
+        return data
+
     def _cleanup_old_versions(self, plugin_name: str, keep_version: str):
         """删除 using_plugins/<plugin>/ 下除 keep_version 外的所有版本目录"""
         using_dir = self.USING_PLUGINS / plugin_name
         if not using_dir.exists():
             return
-        for item in using_dir.iterdir():
-            if item.is_dir() and item.name != keep_version and item.name != "current":
-                shutil.rmtree(item)
-                print(f"删除旧版本目录: {item}")
-
-    def _calculate_file_hash(self, file_path: Path) -> str:
-        """计算文件哈希值"""
-        hasher = hashlib.sha256()
+        with os.scandir(using_dir) as it:
+            victims = [e.path for e in it
+                       if e.is_dir() and e.name not in (keep_version, "current")]
+        if not victims:
+            return
+
+        # 先原子地改名移出插件目录（瞬间完成，之后的扫描不会再看到它们），
+        # 再交给 IO 线程池慢慢删除，更新/回滚不必等待删除大量小文件
+        trash_dir = self.PLUGIN_ROOT / ".trash"
+        trash_dir.mkdir(exist_ok=True)
+        for item in victims:
+            version = os.path.basename(item)
+            trashed = trash_dir / f"{plugin_name}_{version}_{uuid.uuid4().hex[:8]}"
+            os.replace(item, trashed)
+            self._forget_version(plugin_name, version)
+            task_id = self.thread_executor.submit(
+                fn=functools.partial(shutil.rmtree, trashed, ignore_errors=True),
+                pool_name="io_default"
+            )
+            if task_id is None:  # IO 线程池不可用时同步删除
+                shutil.rmtree(trashed, ignore_errors=True)
+            logger.debug("删除旧版本目录: %s", item)
+
+    @with_registry_lock
+    def _register_version(self, plugin_name: str, version_dir: Path):
+        """安装/回滚后只登记这一个版本目录（与 discover_plugins 共用 _scan_one_version）"""
+        version = version_dir.name
+        self._forget_version(plugin_name, version)  # 同名版本被覆盖安装时，旧的缓存一并作废
+        _, plugin_version = self._scan_one_version((plugin_name, version, str(version_dir)))
+        if plugin_version is None:
+            raise PluginManagerError(500, f"版本目录 {version_dir} 中缺少 plugin.py")
+        self.plugin_registry.setdefault(plugin_name, PluginVersionSet()).add(plugin_version)
+        self._save_stat_cache()
+
+    @with_registry_lock
+    def _forget_version(self, plugin_name: str, version: str):
+        """版本目录被删除后，从注册表移除该版本并丢弃它的缓存条目，其余版本不受影响"""
+        versions = self.plugin_registry.get(plugin_name)
+        if versions is not None:
+            versions.discard(version)
+        self.metadata_cache.pop((plugin_name, version), None)
+        # 已执行的模块同样按版本丢弃（list 先取快照，load_all 可能在其他线程写入缓存）
+        for key in [k for k in list(self._module_cache) if k[:2] == (plugin_name, version)]:
+            self._module_cache.pop(key, None)
+        sys.modules.pop(self._module_name(plugin_name, version), None)
+        # 该版本目录下文件的状态缓存也一并删除，避免持久化缓存无限增长
+        prefix = os.path.join(str(self.USING_PLUGINS / plugin_name / version), "")
+        with self._stat_cache_lock:
+            stale = [k for k in self._stat_cache if k.startswith(prefix)]
+            for key in stale:
+                del self._stat_cache[key]
+            if stale:
+                self._stat_cache_dirty = True
+
+    def _calculate_file_hash(self, file_path: Union[str, Path], st: Optional[os.stat_result] = None) -> str:
+        """计算文件哈希值（文件 mtime/size 未变化时直接返回缓存）；调用方已 stat 过可传入 st"""
+        st = st or os.stat(file_path)
+        entry = self._stat_cache.get(str(file_path))
+        if entry and entry[0] == st.st_mtime_ns and entry[1] == st.st_size and entry[2]:
+            return entry[2]
+
+        # 文件变化后整体重算：要找出哪些页变了本身就得读完整个文件，分页增量哈希省不下 I/O，
+        # 只会让缓存膨胀并改变哈希格式；未变化的文件已由上面的 (mtime, size) 缓存跳过。
+        # 小文件（典型的 plugin.py）直接一次 read；中等文件用 mmap 一次性交给哈希函数，
+        # 没有逐块读取和 bytes 拷贝；超大文件改用 file_digest 在 C 层分块读取，避免映射过大的地址空间
         with open(file_path, 'rb') as f:
-            while chunk := f.read(8192):
-                hasher.update(chunk)
+            if st.st_size < self.MMAP_HASH_MIN:  # 也覆盖了空文件（mmap 不能映射空文件）
+                digest = file_hasher(f.read()).hexdigest()
+            elif st.st_size <= self.MMAP_HASH_LIMIT:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    digest = file_hasher(mm).hexdigest()
+            else:
+                digest = self._digest_large_file(f)
+        with self._stat_cache_lock:
+            self._stat_cache[str(file_path)] = [st.st_mtime_ns, st.st_size, digest, None]
+            self._stat_cache_dirty = True
+        return digest
+
+    @staticmethod
+    def _digest_large_file(f) -> str:
+        """分块计算大文件哈希；Python 3.11 以下没有 hashlib.file_digest 时，
+        用预分配的 1MB 缓冲区 readinto，避免每块都分配新的 bytes 对象"""
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, file_hasher).hexdigest()
+        hasher = file_hasher()
+        buf = bytearray(1 << 20)
+        view = memoryview(buf)
+        raw = f.raw if hasattr(f, 'raw') else f  # 绕过 BufferedReader，避免二次缓冲
+        while n := raw.readinto(buf):
+            hasher.update(view[:n])
         return hasher.hexdigest()
 
+    def _load_stat_cache(self) -> Dict[str, list]:
+        """读取持久化的文件状态缓存，文件不存在或损坏时返回空缓存"""
+        try:
+            raw = self._cache_path.read_bytes()
+            return msgpack.unpackb(raw, raw=False) if msgpack else json_loads(raw)
+        except Exception:  # 缓存可随时重建，读取失败或内容损坏都当作没有缓存
+            return {}
+
+    def _save_stat_cache(self):
+        """写回文件状态缓存（先写临时文件再原子替换）"""
+        # 锁内只复制字典，序列化和写文件在锁外进行
+        with self._stat_cache_lock:
+            if not self._stat_cache_dirty:
+                return
+            snapshot = dict(self._stat_cache)
+            self._stat_cache_dirty = False
+        tmp_path = self._cache_path.with_suffix(".tmp")
+        try:
+            if msgpack:
+                data = msgpack.packb(snapshot, use_bin_type=True)
+            else:
+                data = json_dumps(snapshot)
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, self._cache_path)
+        except OSError as e:
+            self._stat_cache_dirty = True  # 下次保存时重试
+            logger.warning("保存插件缓存失败: %s", e)
+
     def shutdown(self):
         """关闭插件管理器"""
-        print("关闭插件管理器...")
+        logger.info("关闭插件管理器...")
+        # 先通知所有插件停止，让它们并行退出，再逐个卸载
+        for instance in list(self.active_plugins.values()):
+            instance.stop_event.set()
+
         # 卸载所有插件
         for plugin_name in list(self.active_plugins.keys()):
             try:
                 self.unload_plugin(plugin_name)
             except Exception as e:
-                print(f"卸载插件 {plugin_name} 失败: {str(e)}")
+                logger.warning("卸载插件 %s 失败: %s", plugin_name, e)
         
+        # 保存文件状态缓存，下次启动复用
+        self._save_stat_cache()
+
         # 清理信号
         self.signal_manager.unregister_regular_signal("plugin_manager", "plugin_loaded")
         self.signal_manager.unregister_regular_signal("plugin_manager", "plugin_unloaded")
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     # 初始化服务总线
     core_bus = CoreServiceBus()
     service_names = core_bus.get_registered_services()
@@ -493,13 +913,13 @@ if __name__ == '__main__':
     plugin_manager.rollback_plugin("example_plugin", "v1_0_0")
     
     # 获取所有已加载插件的状态
-    plugin_manager.get_loaded_plugins()
+    print("已加载插件状态:", dict(plugin_manager.get_loaded_plugins()))
 
     # 卸载插件
     plugin_manager.unload_plugin("example_plugin")
     
     # 获取所有已加载插件的状态
-    plugin_manager.get_loaded_plugins()
+    print("已加载插件状态:", dict(plugin_manager.get_loaded_plugins()))
 
     # 关闭插件管理器
     plugin_manager.shutdown()
\ No newline at end of file
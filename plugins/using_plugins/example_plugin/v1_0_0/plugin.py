@@ -3,11 +3,12 @@ from base_module import BaseModule
 class ExamplePlugin(BaseModule):
     def __init__(self, service_proxy):
         super().__init__()
+        self.proxy = service_proxy
         print("ExamplePlugin 初始化完成")
 
-    @property
-    def module_name(self):
-        return "example_plugin"
+    module_name = "example_plugin"
 
     def run(self):
-        print("ExamplePlugin 正在运行")
\ No newline at end of file
+        # 循环中等待停止事件，插件管理器 stop() 时立即退出
+        while not self.proxy.stop_event.wait(timeout=1.0):
+            print("ExamplePlugin 正在运行")
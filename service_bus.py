@@ -1,6 +1,9 @@
 from path_cof import PROJECT_ROOT
-from typing import Any, Dict, List
-from PyQt5.QtCore import QObject, pyqtSignal, QTimer, QMutex, QMutexLocker
+import logging
+import threading
+from types import MappingProxyType
+from typing import Any, ClassVar, Dict, List, Mapping, Optional
+from PyQt5.QtCore import QObject, pyqtSignal, QTimer
 from dataclasses import dataclass
 from signal_manager import SignalManager
 from thread_executor import ThreadExecutor
@@ -14,18 +17,10 @@ from database.write_data import WriteData
 # from sqlalchemy import create_engine
 # from sqlalchemy.orm import sessionmaker
 
-# 锁装饰器，用于代码复用
-def with_mutex(lock):
-    def decorator(func):
-        def wrapper(*args, **kwargs):
-            with QMutexLocker(lock):
-                return func(*args, **kwargs)
-        return wrapper
-    return decorator
-""""""
-
-#  核心总线数据表结构定义
-@dataclass
+logger = logging.getLogger(__name__)
+
+#  核心总线数据表结构定义（不可变：注册表之间可以直接共享同一个实例）
+@dataclass(frozen=True, slots=True)
 class ServiceMetadata:
     """服务元数据规范
         Attributes:
@@ -34,7 +29,7 @@ class ServiceMetadata:
     instances: Dict[str, List[str]]
 
 # 插件总线数据表结构定义
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PluginServiceMetadata(ServiceMetadata):  # 继承核心总线数据结构
     """插件服务元数据规范（扩展自核心服务元数据）
         Attributes:
@@ -80,8 +75,16 @@ class CoreServiceBus(QObject):
     def __init__(self):
         """父类核心初始化"""
         super().__init__()
-        print("服务总线初始化")
-        self._service_registry: Dict[str, Any] = {}
+        logger.debug("服务总线初始化")
+        # 只有注册/注销等写操作加锁；写操作整体替换注册表快照（写时复制），读操作直接读当前快照，无需加锁
+        # 用可重入锁：注册/注销信号在锁内发出，槽函数里再注册/注销服务不会死锁
+        self._lock = threading.RLock()
+        self._service_registry: Mapping[str, Any] = MappingProxyType({})
+        self._service_names: tuple = ()  # 与注册表快照同时替换的服务名称元组
+        # 已通过校验的服务查询缓存：命中时 get_service 不加锁、不重复校验
+        self._service_cache: Dict[str, Any] = {}
+        # 各服务最近一次上报的健康状态 {服务名称: 状态}
+        self._health_state: Dict[str, str] = {}
         self._interface_metadata: Dict[str, ServiceMetadata] = {
             "thread": ServiceMetadata({"thread": ["submit", "create_pool", "shutdown_pool"]}),
             "database": ServiceMetadata({"database": ["read", "write"]}),
@@ -90,6 +93,7 @@ class CoreServiceBus(QObject):
             "window": ServiceMetadata({"window": ["create_window", "delete_window"]}),
             "network": ServiceMetadata({"network": ["connect", "send", "receive", "disconnect"]})
         }
+        self._rebuild_whitelist()
 
         self.signal_manager = SignalManager()  # 初始化信号管理器
         self.__register_service(self.signal_manager.module_name, self.signal_manager)  # 注册信号管理器
@@ -111,64 +115,102 @@ class CoreServiceBus(QObject):
 
 
     def __init_health_check_signal(self) -> None:
-        print("心跳监测定时器初始化")
-        """初始化心跳监测定时器"""
-        self.health_check_timer = QTimer()
-        # 当定时器超时（到达设定时间）时，连接到_perform_health_checks方法
-        self.health_check_timer.timeout.connect(self.__on_health_checks)
-        self.health_check_timer.start(30000)  # 30秒检测一次
-
-
-    @with_mutex(lock=QMutex(QMutex.Recursive))
-    def __on_health_checks(self) -> None:
-        """
-        这里不能删掉，因为这个是作为心跳检测的槽函数的
-        我修改了名称显示 槽函数以_on_开头。
-        但具体要操作什么目前没想好(之前是检测数据库连接)
+        """初始化心跳监测定时器
+        健康状态由各服务通过 health_changed 信号主动上报；
+        需要主动探测的服务实现 health_check()，由这一个定时器统一轮询，服务自身不再各开定时器
         """
-        pass
+        logger.debug("心跳监测定时器初始化")
+        self.health_check_timer = QTimer()
+        # 当定时器超时（到达设定时间）时，连接到_health_check_tick方法
+        self.health_check_timer.timeout.connect(self._health_check_tick)
+        self._update_health_check_interval()
+        self.health_check_timer.start()
+
+    def _update_health_check_interval(self) -> None:
+        """有服务需要主动探测时 30 秒检测一次，否则只保留 5 分钟的兜底看门狗"""
+        timer = getattr(self, "health_check_timer", None)
+        if timer is None:
+            return
+        active = any(callable(getattr(svc, "health_check", None)) for svc in self._service_registry.values())
+        timer.setInterval(30000 if active else 300000)
+
+    def _health_check_tick(self) -> None:
+        """统一的主动健康检测：依次调用各服务的 health_check()，返回字符串时记为该服务的健康状态"""
+        for name, svc in self._service_registry.items():
+            check = getattr(svc, "health_check", None)
+            if not callable(check):
+                continue
+            try:
+                status = check()
+            except Exception as e:
+                status = f"error: {e}"
+            if isinstance(status, str):
+                self._health_state[name] = status
+
+    def __on_health_changed(self, name: str, status: str) -> None:
+        """服务健康状态变化的槽函数，记录最新状态"""
+        self._health_state[name] = status
 
     # 核心层基础方法
-    @with_mutex(lock=QMutex(QMutex.Recursive))
     def __register_service(self, name: str, service: Any) -> None:
         """注册服务
         :param name: 服务名称
         :param service: 服务实例
         """
-        print(f"注册服务: {name}")
+        logger.debug("注册服务: %s", name)
         try:
-            if not isinstance(service, object):
-                raise ServiceBusError(400, "Service must be a Object")
-
+            # 乐观检查：重复注册直接失败，不进入临界区
             if name in self._service_registry:
-                raise ServiceBusError(f"Service {name} is already registered")
-            # 存储服务实例到注册表
-            self._service_registry[name] = service
-            # 发出服务注册信号
-            self.service_registered.emit(name)
+                raise ServiceBusError(409, f"Service {name} is already registered")
+            with self._lock:
+                # 加锁后再检查一次，防止并发注册同名服务
+                if name in self._service_registry:
+                    raise ServiceBusError(409, f"Service {name} is already registered")
+                # 存储服务实例到注册表（构建新快照后整体替换）
+                self._service_registry = MappingProxyType({**self._service_registry, name: service})
+                self._service_names = tuple(self._service_registry)
+                self._service_cache.pop(name, None)
+                # 服务主动上报健康状态，不依赖定时轮询
+                health_changed = getattr(service, "health_changed", None)
+                if health_changed is not None:
+                    health_changed.connect(self.__on_health_changed)
+                self._update_health_check_interval()
+                # 发出服务注册信号
+                self.service_registered.emit(name)
         except ServiceBusError as e:
-            print(f"服务注册失败: {type(e).__name__} - {str(e)}")
+            logger.warning("服务注册失败: %s - %s", type(e).__name__, e)
             return None
 
-    @with_mutex(lock=QMutex(QMutex.Recursive))
     def __unregister_service(self, name: str) -> None:
         """注销服务
         :param name: 要注销的服务名称
         """
-        print(f"正在注销服务: {name}")  # 增强日志输出
-        try:
-            if name not in self._service_registry:
-                raise ServiceBusError(404, f"Service '{name}' not found")
-
-            # 先发出信号再删除服务
-            self.service_unregistered.emit(name)
-            del self._service_registry[name]
+        with self._lock:
+            logger.debug("正在注销服务: %s", name)
+            try:
+                if name not in self._service_registry:
+                    raise ServiceBusError(404, f"Service '{name}' not found")
+
+                # 先发出信号再删除服务
+                self.service_unregistered.emit(name)
+                registry = dict(self._service_registry)
+                service = registry.pop(name)
+                self._service_registry = MappingProxyType(registry)
+                self._service_names = tuple(registry)
+                self._service_cache.pop(name, None)
+                self._health_state.pop(name, None)
+                health_changed = getattr(service, "health_changed", None)
+                if health_changed is not None:
+                    try:
+                        health_changed.disconnect(self.__on_health_changed)
+                    except TypeError:
+                        pass
+                self._update_health_check_interval()
+
+            except ServiceBusError as e:
+                logger.warning("服务获取失败: %s - %s", type(e).__name__, e)
+                return None
 
-        except ServiceBusError as e:
-            print(f"服务获取失败: {type(e).__name__} - {str(e)}")
-            return None
-
-    @with_mutex(lock=QMutex(QMutex.Recursive))
     def get_registered_services(self, include_metadata: bool = False) -> list:
         """获取已注册服务列表
         :param include_metadata: 是否包含元数据（默认只返回服务名称）
@@ -176,10 +218,13 @@ class CoreServiceBus(QObject):
         """
         if include_metadata:
             return list(self._interface_metadata.items())
-        return list(self._service_registry.keys())
+        return list(self._service_names)
+
+    def registered_services_view(self) -> tuple:
+        """获取已注册服务名称的只读快照（不复制，适合只需遍历的调用方）"""
+        return self._service_names
 
 
-    @with_mutex(lock=QMutex(QMutex.Recursive))
     def get_service(self, name: str) -> Any:
         """获取已注册的服务实例
         使用示例：
@@ -189,69 +234,95 @@ class CoreServiceBus(QObject):
         获取信号中心实例：signal_center = core_bus.get_service("signal")
         使用信号中心注册信号：signal_center.register_signal("my_signal")
         """
+        # 快速路径：dict.get 本身是原子的，命中缓存时不需要加锁
+        service = self._service_cache.get(name)
+        if service is not None:
+            return service
+        registry = self._service_registry  # 取一次快照，后续检查都基于同一份注册表
         try:
             # 检查服务是否存在
-            if name not in self._service_registry:
+            if name not in registry:
                 raise ServiceBusError(404, f"Service '{name}' not found")
             # 权限校验（基于接口元数据白名单）
             if not self._check_access_permission(name):
                 raise PermissionDeniedError(service=name, method="get_service")
 
-            return self._service_registry[name]
+            service = registry[name]
+            # 写缓存与注销互斥，避免把刚注销的服务写回缓存
+            with self._lock:
+                if self._service_registry.get(name) is service:
+                    self._service_cache[name] = service
+            return service
         except (PermissionDeniedError, ServiceBusError) as e:
-            print(f"服务获取失败: {type(e).__name__} - {str(e)}")
+            logger.warning("服务获取失败: %s - %s", type(e).__name__, e)
             return None
 
 
+    def _rebuild_whitelist(self) -> None:
+        """根据接口元数据重建访问白名单，修改 _interface_metadata 后必须调用"""
+        self._whitelist = frozenset(self._interface_metadata)
+
     def _check_access_permission(self, service_name: str) -> bool:
         """访问权限检查（需根据实际白名单机制实现）"""
         # 示例实现：检查服务是否在公开白名单中
-        return service_name in self._interface_metadata
+        return service_name in self._whitelist
 
 
-    @with_mutex(lock=QMutex(QMutex.Recursive))
     def shutdown(self) -> None:
         """
         关闭服务总线
         """
-        print("关闭服务总线")
-        # 停止心跳检测定时器
-        self.health_check_timer.stop()
-        # 清空服务注册表
-        self._service_registry.clear()
+        with self._lock:
+            logger.debug("关闭服务总线")
+            # 停止心跳检测定时器
+            self.health_check_timer.stop()
+            # 清空服务注册表
+            self._service_registry = MappingProxyType({})
+            self._service_names = ()
+            self._service_cache.clear()
 
 class PluginServiceBus(QObject):
 
     plugin_registered = pyqtSignal(str)  # 插件注册信号
     plugin_unregistered = pyqtSignal(str)  # 插件注销信号
 
+    # 核心服务对应的插件元数据只构建一次，各插件总线实例共享其中不可变的条目
+    _default_plugin_meta: ClassVar[Optional[Dict[str, PluginServiceMetadata]]] = None
+    _default_meta_source: ClassVar[Optional[Dict[str, ServiceMetadata]]] = None
+
     def __init__(self,core_bus: CoreServiceBus):
         """子类插件总线初始化"""
         super().__init__()
-        print("插件服务总线初始化")
+        logger.debug("插件服务总线初始化")
         self._core_bus = core_bus
         # 初始化插件注册表
-        self._plugin_registry: Dict[str, PluginServiceMetadata] = {
-            name: PluginServiceMetadata(
-                instances=metadata.instances,
-                version="1.0.0",
-                interface_format="core-service"
-            )
-            for name, metadata in self._core_bus._interface_metadata.items()
-        }
+        self._plugin_registry: Dict[str, PluginServiceMetadata] = dict(
+            self._core_plugin_metadata(self._core_bus._interface_metadata))
+
+    @classmethod
+    def _core_plugin_metadata(cls, interface_metadata: Dict[str, ServiceMetadata]) -> Dict[str, PluginServiceMetadata]:
+        """返回核心服务对应的插件元数据；来源的接口元数据没变时复用上次构建的结果"""
+        if cls._default_meta_source is not interface_metadata:
+            cls._default_plugin_meta = {
+                name: PluginServiceMetadata(
+                    instances=metadata.instances,
+                    version="1.0.0",
+                    interface_format="core-service"
+                )
+                for name, metadata in interface_metadata.items()
+            }
+            cls._default_meta_source = interface_metadata
+        return cls._default_plugin_meta
 
     def register_plugin(self, name: str, service: Any) -> None:
         """注册插件
         :param name: 插件名称
         :param service: 插件实例
         """
-        print("注册插件")
+        logger.debug("注册插件: %s", name)
         try:
-            if not isinstance(service, object):
-                raise ServiceBusError(400, "Service must be a Object")
-
             if name in self._plugin_registry:
-                raise ServiceBusError(f"Plugin {name} already registered")
+                raise ServiceBusError(409, f"Plugin {name} already registered")
             # 仅操作插件注册表，不再调用核心总线的注册方法
             plugin_metadata = PluginServiceMetadata(
                 instances= {name: service},      # 插件实例
@@ -263,7 +334,7 @@ class PluginServiceBus(QObject):
             # 发出插件注册信号
             self.plugin_registered.emit(name)
         except ServiceBusError as e:
-            print(f"插件服务注册失败: {type(e).__name__} - {str(e)}")
+            logger.warning("插件服务注册失败: %s - %s", type(e).__name__, e)
             return None
 
     def unregister_plugin(self, name: str) -> None:
@@ -272,7 +343,7 @@ class PluginServiceBus(QObject):
         """
         try:
             if name not in self._plugin_registry:
-                raise ServiceBusError(f"Plugin {name} not found")
+                raise ServiceBusError(404, f"Plugin {name} not found")
 
             metadata = self._plugin_registry[name]
             if metadata.interface_format != "plugin-service":
@@ -282,7 +353,7 @@ class PluginServiceBus(QObject):
             self.plugin_unregistered.emit(name)  # 触发注销信号
 
         except (ServiceBusError, PermissionDeniedError) as e:
-            print(f"插件注销失败: {type(e).__name__} - {str(e)}")
+            logger.warning("插件注销失败: %s - %s", type(e).__name__, e)
             return None
 
     def get_plugin(self, name: str) -> PluginServiceMetadata:
@@ -296,7 +367,7 @@ class PluginServiceBus(QObject):
         """
         关闭插件服务总线
         """
-        print("关闭插件服务总线")
+        logger.debug("关闭插件服务总线")
         # 遍历并注销所有插件
         for plugin_name in list(self._plugin_registry.keys()):
             self.unregister_plugin(plugin_name)
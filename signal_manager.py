@@ -60,9 +60,7 @@ class SignalManager(BaseModule):
         self._lock = threading.RLock() 
         print("SignalManager 初始化完成")
     #设置模块名称
-    @property
-    def module_name(self) -> str:
-        return "signal"
+    module_name = "signal"
         # 
     class SignalContainer(QObject):
         """信号容器用于正确绑定信号到QObject
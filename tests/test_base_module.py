@@ -0,0 +1,62 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from base_module import BaseModule  # noqa: E402
+
+PLUGIN_SOURCE = '''
+from base_module import BaseModule
+
+class ExamplePlugin(BaseModule):
+    module_name = "test_versioned_plugin"
+'''
+
+
+class VersionedPluginRegistrationTest(unittest.TestCase):
+    """插件管理器按 plugins_<插件名>_<版本> 导入每个版本，升级时新版本的类应替换旧版本"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.plugin_dir = Path(self._tmp.name) / "example_plugin"
+        self.module_names = []
+
+    def tearDown(self):
+        for name in self.module_names:
+            sys.modules.pop(name, None)
+        self._tmp.cleanup()
+
+    def _import_version(self, version: str) -> type:
+        """与 PluginManager._import_plugin 相同的方式导入指定版本"""
+        file_path = self.plugin_dir / version / "plugin.py"
+        file_path.parent.mkdir(parents=True)
+        file_path.write_text(PLUGIN_SOURCE, encoding="utf-8")
+        module_name = f"plugins_example_plugin_{version.replace('.', '_')}"
+        self.module_names.append(module_name)
+        spec = importlib.util.spec_from_file_location(module_name, file_path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+        return module.ExamplePlugin
+
+    def test_new_version_replaces_old_version(self):
+        old_cls = self._import_version("v1.0.0")
+        old_id = BaseModule.get_id_by_name("test_versioned_plugin")
+
+        new_cls = self._import_version("v1.2.0")
+
+        self.assertIsNot(old_cls, new_cls)
+        self.assertEqual(BaseModule.get_id_by_name("test_versioned_plugin"), old_id)
+        self.assertIs(BaseModule.get_class_by_id(old_id), new_cls)
+
+    def test_same_name_from_unrelated_module_still_collides(self):
+        self._import_version("v1.0.0")
+        with self.assertRaises(ValueError):
+            type("OtherPlugin", (BaseModule,), {"module_name": "test_versioned_plugin"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,17 +1,24 @@
-from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, Qt, QThreadPool, QTimer
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal, pyqtSlot, Qt, QThreadPool, QTimer, QThread, QMetaObject
 from concurrent.futures import ThreadPoolExecutor, Future
 from typing import Any, Callable, Dict, Optional, Union, Tuple
+import logging
 import threading
-import traceback
 from dataclasses import dataclass
 import os
+import itertools
 import time
-import uuid
+from functools import partial
 
 from base_module import BaseModule
 
+logger = logging.getLogger(__name__)
 
-@dataclass
+# 任务ID序号：next() 在 GIL 下是原子的，进程号前缀保证跨进程不重复，不必每次读系统随机源生成 uuid
+_task_counter = itertools.count()
+_task_id_prefix = f"{os.getpid():x}"
+
+
+@dataclass(slots=True)
 class TaskResult:
     """标准化任务执行结果容器"""
     success: bool
@@ -24,7 +31,7 @@ class TaskSignals(QObject):
     """任务生命周期信号集合"""
     started = pyqtSignal(str)  # 任务ID
     succeeded = pyqtSignal(str, str)  # 任务ID, 结果
-    failed = pyqtSignal(str, str)  # 任务ID, 错误信息
+    failed = pyqtSignal(str, object)  # 任务ID, 异常对象（需要堆栈时由槽函数按需格式化）
     cancelled = pyqtSignal(str)  # 任务ID
     finished = pyqtSignal(str)  # 任务ID
 
@@ -33,7 +40,6 @@ class TaskWrapper(QRunnable):
     """任务执行容器"""
 
     def __init__(self, task_id: str, fn: Callable, *args, **kwargs):
-        print("任务执行容器初始化")
         super().__init__()
         self.task_id = task_id
         self.fn = fn
@@ -42,10 +48,10 @@ class TaskWrapper(QRunnable):
         self.signals = TaskSignals()
         self._state_lock = threading.Lock()
         self._state = "PENDING"  # PENDING | RUNNING | CANCELLED
+        self.future: Optional[Future] = None  # 提交到 ThreadPoolExecutor 后得到的 Future，Qt 线程池为 None
 
     def run(self) -> None:
         """原子化任务执行流程"""
-        print("原子化任务执行流程")
         with self._state_lock:
             if self._state == "CANCELLED":
                 self.signals.cancelled.emit(self.task_id)
@@ -57,51 +63,84 @@ class TaskWrapper(QRunnable):
             result = self.fn(*self.args, **self.kwargs)
             self.signals.succeeded.emit(self.task_id, result)
         except Exception as e:
-            error_msg = f"{type(e).__name__}: {str(e)}"
-            tb = traceback.format_exc()
-            self.signals.failed.emit(self.task_id, f"{error_msg}\nTraceback:\n{tb}")
+            # 只传异常对象（__traceback__ 已挂在上面），没有人读取时不必遍历栈帧拼接字符串
+            self.signals.failed.emit(self.task_id, e)
         finally:
             self.signals.finished.emit(self.task_id)
 
     def cancel(self) -> bool:
         """原子化任务取消操作"""
-        print("原子化任务取消操作")
         with self._state_lock:
             if self._state == "PENDING":
                 self._state = "CANCELLED"
                 return True
             return False
 
-class DaemonTask:
-    """守护任务包装器，用于管理周期性执行的任务"""
-    def __init__(self, task_id: str, fn: Callable, interval: float, *args, **kwargs):
+class DaemonTask(QObject):
+    """守护任务包装器，用于管理周期性执行的任务
+    由所在线程事件循环中的 QTimer 周期触发，两次执行之间不占用任何线程；
+    指定 dispatch 时任务体交给线程池执行，否则直接在事件循环线程中执行
+    """
+    def __init__(self, task_id: str, fn: Callable, interval: float,
+                 dispatch: Optional[Callable[[Callable], Any]] = None, *args, **kwargs):
+        super().__init__()
         self.task_id = task_id
         self.fn = fn
         self.interval = interval
         self.args = args
         self.kwargs = kwargs
         self.stop_event = threading.Event()
-        self.last_execution = time.time()
-        
-    def run(self):
-        """守护任务执行循环"""
-        while not self.stop_event.is_set():
-            try:
-                # 执行用户函数
-                result = self.fn(*self.args, **self.kwargs)
-                self.last_execution = time.time()
-                # 可以添加结果处理逻辑
-            except Exception as e:
-                error_msg = f"Daemon task error: {str(e)}"
-                traceback.print_exc()
-                # 可以添加错误处理逻辑
-            
-            # 等待直到下一个执行周期或停止事件
-            self.stop_event.wait(self.interval)
-    
+        self.last_execution = time.monotonic_ns()  # 单调时钟纳秒数，只用于内部计时，不受系统校时影响
+        self._dispatch = dispatch
+        self._idle = threading.Event()  # 没有正在执行的任务体时置位
+        self._idle.set()
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(interval * 1000))
+        self._timer.timeout.connect(self._tick)
+
+    @pyqtSlot()
+    def start(self):
+        """启动定时器并立即执行一次（需在所属线程中调用）"""
+        if self.stop_event.is_set():
+            return
+        self._timer.start()
+        self._tick()
+
+    def _tick(self):
+        """定时器触发：上一次还没执行完时跳过本次，保持与原先串行循环相同的语义"""
+        if self.stop_event.is_set() or not self._idle.is_set():
+            return
+        self._idle.clear()
+        if self._dispatch is None:
+            self._run_once()
+        elif self._dispatch(self._run_once) is None:
+            self._idle.set()  # 提交失败（线程池已关闭），等下一个周期重试
+
+    def _run_once(self):
+        """执行一次用户函数"""
+        try:
+            self.fn(*self.args, **self.kwargs)
+            self.last_execution = time.monotonic_ns()
+        except Exception:
+            logger.exception("守护任务 %s 执行出错", self.task_id)
+        finally:
+            self._idle.set()
+
     def stop(self):
         """停止守护任务"""
         self.stop_event.set()
+        # QTimer 只能在所属线程中停止，跨线程调用时排队执行
+        if QThread.currentThread() is self.thread():
+            self._timer.stop()
+        else:
+            QMetaObject.invokeMethod(self._timer, "stop", Qt.QueuedConnection)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """等待正在执行的任务体结束"""
+        # 任务体在本线程的事件循环中执行时，在这里阻塞等待只会自己等自己
+        if self._dispatch is None and QThread.currentThread() is self.thread():
+            return self._idle.is_set()
+        return self._idle.wait(timeout)
 
 class ThreadExecutor(BaseModule):
     """独立线程池管理系统
@@ -116,31 +155,41 @@ class ThreadExecutor(BaseModule):
     pool_created = pyqtSignal(str, str)  # (池名称, 池类型)
     pool_closed = pyqtSignal(str)  # 池名称
 
+    # 默认线程池规格 {名称: (类型, 参数)}，第一次向该池提交任务时才创建
+    # 新建 QThreadPool 的默认线程数即 idealThreadCount，与全局线程池一致
+    # daemon_default 由 _ensure_daemon_pool_exists 按守护任务的需要创建
+    _DEFAULT_POOL_SPECS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+        "qt_default": ("qt", {}),
+        "io_default": ("standard", {"max_workers": 8}),  # 串行执行，操作系统调度
+        "compute_default": ("standard", {"max_workers": os.cpu_count()}),
+    }
+
     def __init__(self, parent=None):
-        print("独立线程池管理系统初始化")
+        logger.debug("独立线程池管理系统初始化")
         super().__init__(parent)
-        # 线程池配置 {name: (type, instance)}
-        self._pools: Dict[str, Tuple[str, Union[QThreadPool, ThreadPoolExecutor]]] = {}
+        # 线程池配置 {name: (type, instance, submit_fn)}，submit_fn(task) 在建池时针对该池生成
+        self._pools: Dict[str, Tuple[str, Union[QThreadPool, ThreadPoolExecutor], Callable]] = {}
         # 任务注册表 {task_id: (pool_name, task)}
-        self._task_registry: Dict[str, Tuple[str, Union[TaskWrapper, Future, DaemonTask]]] = {}
+        self._task_registry: Dict[str, Tuple[str, Union[TaskWrapper, DaemonTask]]] = {}
         self._registry_lock = threading.RLock()
         self._daemon_tasks: Dict[str, DaemonTask] = {}  # 守护任务注册表
+        # 守护任务注册表的不可变快照 ((task_id, task, pool_name), ...)，只在提交/停止时重建
+        self._daemon_snapshot: Tuple[Tuple[str, DaemonTask, Optional[str]], ...] = ()
         self._daemon_lock = threading.RLock()  # 守护任务专用锁
+        # 尚未创建的默认线程池，启动时不建池、不起线程
+        self._pending_pools: Dict[str, Tuple[str, Dict[str, Any]]] = dict(self._DEFAULT_POOL_SPECS)
 
-        # 重构 ThreadExecutor 的初始化流程，确保信号发射发生在对象完全初始化之后
-        self._init_default_pools()  # 使用单次定时器延迟初始化
-        # self._init_default_pools()
-
-    @property
-    def module_name(self) -> str:
-        return "thread"
-    def _init_default_pools(self):
-        """初始化默认线程池"""
-        print("初始化默认线程池")
-        self.create_pool("qt_default", "qt", max_threads=QThreadPool.globalInstance().maxThreadCount())
-        self.create_pool("io_default", "standard", max_workers=8)#串行执行，操作系统调度
-        self.create_pool("compute_default", "standard", max_workers=os.cpu_count())
-        self.create_pool("daemon_default", "daemon", max_workers=os.cpu_count())
+    module_name = "thread"
+    def _ensure_pool(self, name: str) -> bool:
+        """线程池已存在返回 True；默认线程池在首次使用时按规格创建"""
+        with self._registry_lock:
+            if name in self._pools:
+                return True
+            spec = self._pending_pools.pop(name, None)
+            if spec is None:
+                return False
+            pool_type, kwargs = spec
+            return self.create_pool(name, pool_type, **kwargs)
 
     def create_pool(self, name: str, pool_type: str, **kwargs) -> bool:
         """创建新线程池
@@ -150,7 +199,7 @@ class ThreadExecutor(BaseModule):
             - qt: max_threads
             - standard: max_workers, etc
         """
-        print("创建新线程池")
+        logger.debug("创建新线程池: %s (%s)", name, pool_type)
         with self._registry_lock:
             if name in self._pools:
                 return False
@@ -159,19 +208,29 @@ class ThreadExecutor(BaseModule):
                 pool = QThreadPool()
                 if 'max_threads' in kwargs:
                     pool.setMaxThreadCount(kwargs['max_threads'])
-                self._pools[name] = (pool_type, pool)
+                # 直接用绑定方法 pool.start 作为提交函数
+                self._pools[name] = (pool_type, pool, pool.start)
                 self.pool_created.emit(name, "QT")
                 return True
 
             elif pool_type == "standard":
                 workers = kwargs.get('max_workers', os.cpu_count())
                 pool = ThreadPoolExecutor(max_workers=workers)
-                self._pools[name] = (pool_type, pool)
+                self._pools[name] = (pool_type, pool, self._make_standard_submit(pool))
                 self.pool_created.emit(name, "STANDARD")
                 return True
 
             return False
 
+    @staticmethod
+    def _make_standard_submit(pool: ThreadPoolExecutor) -> Callable[[TaskWrapper], Future]:
+        """生成绑定到指定 ThreadPoolExecutor 的提交函数，返回 Future 供取消时移出队列"""
+        pool_submit = pool.submit
+
+        def _submit(task: TaskWrapper) -> Future:
+            return pool_submit(task.run)
+        return _submit
+
     def submit(
             self,
             fn: Callable,
@@ -181,58 +240,51 @@ class ThreadExecutor(BaseModule):
     ) -> Optional[str]:
         """提交任务到指定线程池
 
-        返回格式：timestamp:pool_name:uuid
-        示例：'1689123456.789:qt_default:abcd-1234'
+        返回格式：monotonic_ns:pool_name:pid-seq（pid、seq 为十六进制）
+        示例：'86400123456789:qt_default:3f2a-1c'
         """
-        print("提交任务到指定线程池")
-        print("pool_name:",pool_name)
         with self._registry_lock:
-            print("pool_name:",pool_name)
-            print("self._pools:",self._pools)
-            if pool_name not in self._pools:
+            if not self._ensure_pool(pool_name):
                 return None
             # 生成可读任务ID
-            task_id = task_id or f"{time.time():.3f}:{pool_name}:{uuid.uuid4().hex[:8]}"
-            pool_type, pool = self._pools[pool_name]
+            task_id = task_id or f"{time.monotonic_ns()}:{pool_name}:{_task_id_prefix}-{next(_task_counter):x}"
+            submit_fn = self._pools[pool_name][2]
             task = TaskWrapper(task_id, fn, *args, **kwargs)
 
-            # 连接任务信号
-            task.signals.started.connect(
-                lambda t_id: self._update_task_state(t_id, "RUNNING"),
-                Qt.QueuedConnection
-            )
-            task.signals.succeeded.connect(
-                lambda t_id, res: self._finalize_task(t_id, res, None),
-                Qt.QueuedConnection
-            )
-            task.signals.failed.connect(
-                lambda t_id, err: self._finalize_task(t_id, None, err),
-                Qt.QueuedConnection
-            )
-            task.signals.cancelled.connect(
-                lambda t_id: self._update_task_state(t_id, "CANCELLED"),
-                Qt.QueuedConnection
-            )
-
-            # 提交到线程池
-            if pool_type == "qt":
-                pool.start(task)
-            else:
-                future = pool.submit(task.run)
-                self._task_registry[task_id] = (pool_name, future)
+            # 连接任务信号：这些槽只在 _registry_lock 下操作注册表，不碰界面，
+            # 直接在工作线程中执行即可，不必经主线程事件循环排队
+            # 信号本身携带任务ID，直接连接预先定义好的方法，不必每次提交都创建闭包
+            signals = task.signals
+            signals.started.connect(self._on_task_started, Qt.DirectConnection)
+            signals.succeeded.connect(self._on_task_succeeded, Qt.DirectConnection)
+            signals.failed.connect(self._on_task_failed, Qt.DirectConnection)
+            signals.cancelled.connect(self._on_task_cancelled, Qt.DirectConnection)
 
+            # 先登记再提交到线程池（提交方式在建池时已按类型选定）
             self._task_registry[task_id] = (pool_name, task)
-            self._update_task_state(task_id, "PENDING")
+            # 已持有 _registry_lock 且刚写入注册表，直接记录 PENDING，不再重入 _update_task_state
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Task %s state changed to %s", task_id, "PENDING")
+            # standard 线程池返回 Future，Qt 线程池（pool.start）返回 None
+            task.future = submit_fn(task)
             return task_id
 
     def shutdown_pool(self, name: str, wait: bool = True) -> bool:
-        """关闭指定线程池"""
-        print("关闭指定线程池")
+        """关闭指定线程池（先停止使用该线程池的守护任务）"""
+        logger.debug("关闭线程池: %s", name)
+        # 先停止使用该线程池的所有守护任务
+        with self._daemon_lock:
+            for task_id, _, pool_name in self._daemon_snapshot:
+                if pool_name == name:
+                    self.stop_daemon_task(task_id, wait=wait)
+
         with self._registry_lock:
             if name not in self._pools:
+                # 还没创建过的默认线程池：关闭后也不再按需创建
+                self._pending_pools.pop(name, None)
                 return False
 
-            pool_type, pool = self._pools[name]
+            pool_type, pool, _ = self._pools[name]
             if pool_type == "qt":
                 pool.waitForDone()
             else:
@@ -243,7 +295,7 @@ class ThreadExecutor(BaseModule):
 
     def cancel_task(self, task_id: str) -> bool:
         """强制取消任务（包括运行中的任务）"""
-        print("强制取消任务")
+        logger.debug("强制取消任务: %s", task_id)
         with self._registry_lock:
             if task_id not in self._task_registry:
                 return False
@@ -254,31 +306,45 @@ class ThreadExecutor(BaseModule):
             if isinstance(task, TaskWrapper):
                 success = task.cancel()
                 if success:
+                    # 还在 ThreadPoolExecutor 队列中的任务直接移出队列，不再占用工作线程
+                    if task.future is not None:
+                        task.future.cancel()
                     self._update_task_state(task_id, "CANCELLED")
                     self._finalize_task(task_id, None, "用户取消")  # 强制清理
-            elif isinstance(task, Future):
-                success = task.cancel()
-                if success:
-                    del self._task_registry[task_id]  # 立即移除
             return success
 
+    def _on_task_started(self, task_id: str) -> None:
+        self._update_task_state(task_id, "RUNNING")
+
+    def _on_task_succeeded(self, task_id: str, result: Any) -> None:
+        self._finalize_task(task_id, result, None)
+
+    def _on_task_failed(self, task_id: str, error: BaseException) -> None:
+        self._finalize_task(task_id, None, error)
+
+    def _on_task_cancelled(self, task_id: str) -> None:
+        self._update_task_state(task_id, "CANCELLED")
+
     def _update_task_state(self, task_id: str, state: str) -> None:
         """原子化状态更新"""
-        print("原子化状态更新")
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         with self._registry_lock:
             if task_id in self._task_registry:
-                print(f"Task {task_id} state changed to {state}")
+                logger.debug("Task %s state changed to %s", task_id, state)
 
-    def _finalize_task(self, task_id: str, result: Any, error: str) -> None:
+    def _finalize_task(self, task_id: str, result: Any, error: Union[BaseException, str, None]) -> None:
         """任务最终处理"""
-        print("任务最终处理")
         with self._registry_lock:
             if task_id in self._task_registry:
                 # 记录执行结果
-                if error:
-                    print(f"Task Failed [{task_id}]: {error}")
-                else:
-                    print(f"Task Completed [{task_id}] Result: {result}")
+                if isinstance(error, BaseException):
+                    # exc_info 只在日志真正输出时才格式化堆栈
+                    logger.warning("Task Failed [%s]: %s", task_id, error, exc_info=error)
+                elif error:
+                    logger.warning("Task Failed [%s]: %s", task_id, error)
+                elif logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Task Completed [%s] Result: %r", task_id, result)
 
                 # 清理注册表
                 del self._task_registry[task_id]
@@ -286,11 +352,10 @@ class ThreadExecutor(BaseModule):
     def get_active_pools(self) -> Dict[str, str]:
         """获取当前活跃线程池信息"""
         #  print("获取当前活跃线程池信息")
-        return {name: typ for name, (typ, _) in self._pools.items()}
+        return {name: typ for name, (typ, _, _) in self._pools.items()}
 
     def get_running_tasks(self) -> Dict[str, str]:
         """获取运行中任务列表"""
-        print("获取运行中任务列表")
         return {
             t_id: pool_name
             for t_id, (pool_name, _) in self._task_registry.items()
@@ -299,7 +364,7 @@ class ThreadExecutor(BaseModule):
         self,
         fn: Callable,
         interval: float,
-        pool_name: str = "daemon_default",
+        pool_name: Optional[str] = "daemon_default",
         task_id: str = None,
         *args, **kwargs
     ) -> Optional[str]:
@@ -307,37 +372,38 @@ class ThreadExecutor(BaseModule):
         
         :param fn: 要执行的任务函数
         :param interval: 执行间隔(秒)
-        :param pool_name: 使用的线程池名称
+        :param pool_name: 执行任务体的线程池名称，None 表示在事件循环线程中直接执行
         :param task_id: 可选的任务ID
         :return: 任务ID或None(失败)
         """
         with self._daemon_lock:
-            # 确保守护线程池存在
-            if not self._ensure_daemon_pool_exists(pool_name):
+            # 确保守护线程池存在；pool_name 为 None 时任务体直接在事件循环线程中执行
+            if pool_name is not None and not self._ensure_daemon_pool_exists(pool_name):
                 return None
             
             # 生成唯一任务ID
-            task_id = task_id or f"daemon_{time.time():.3f}:{uuid.uuid4().hex[:8]}"
+            task_id = task_id or f"daemon_{time.monotonic_ns()}:{_task_id_prefix}-{next(_task_counter):x}"
             
-            # 创建守护任务实例
-            daemon_task = DaemonTask(task_id, fn, interval, *args, **kwargs)
-            
-            # 提交到线程池
-            _, pool = self._pools[pool_name]
-            future = pool.submit(daemon_task.run)
+            # 创建守护任务实例：每个周期只把任务体提交到线程池，不再常驻占用一个工作线程
+            dispatch = None if pool_name is None else partial(self.submit, pool_name=pool_name)
+            daemon_task = DaemonTask(task_id, fn, interval, dispatch, *args, **kwargs)
+            # 定时器挂在执行器所在线程的事件循环上，从任意线程提交都能正常触发
+            daemon_task.moveToThread(self.thread())
+            daemon_task.setParent(self)  # 由执行器持有，注销后在所属线程中 deleteLater 释放
+            QMetaObject.invokeMethod(daemon_task, "start", Qt.QueuedConnection)
             
             # 注册守护任务
             self._daemon_tasks[task_id] = {
                 "task": daemon_task,
-                "future": future,
                 "pool": pool_name
             }
+            self._refresh_daemon_snapshot()
             
             return task_id
     
     def _ensure_daemon_pool_exists(self, pool_name: str) -> bool:
         """确保守护线程池存在，不存在则创建"""
-        if pool_name not in self._pools:
+        if not self._ensure_pool(pool_name):
             # 创建专用于守护任务的线程池
             # 设置较大的max_workers以支持多个守护任务
             return self.create_pool(pool_name, "standard", max_workers=20)
@@ -358,43 +424,38 @@ class ThreadExecutor(BaseModule):
             task_info["task"].stop()  # 设置停止标志
             
             if wait:
-                try:
-                    # 等待任务完成，最多等待2个间隔周期
-                    task_info["future"].result(timeout=task_info["task"].interval * 2)
-                except:
-                    pass
+                # 等待正在执行的任务体完成，最多等待2个间隔周期
+                task_info["task"].wait(timeout=task_info["task"].interval * 2)
             
             # 从注册表中移除
             del self._daemon_tasks[task_id]
+            self._refresh_daemon_snapshot()
+            task_info["task"].deleteLater()
             return True
     
+    def _refresh_daemon_snapshot(self) -> None:
+        """重建守护任务快照（需持有 _daemon_lock）"""
+        self._daemon_snapshot = tuple(
+            (task_id, task_info["task"], task_info["pool"])
+            for task_id, task_info in self._daemon_tasks.items()
+        )
+
     def get_daemon_tasks(self) -> Dict[str, Dict]:
-        """获取所有守护任务的状态信息"""
-        with self._daemon_lock:
-            return {
-                task_id: {
-                    "interval": task_info["task"].interval,
-                    "last_execution": task_info["task"].last_execution,
-                    "pool": task_info["pool"],
-                    "running": not task_info["task"].stop_event.is_set()
-                }
-                for task_id, task_info in self._daemon_tasks.items()
+        """获取所有守护任务的状态信息（遍历快照，不加锁；执行时间等状态实时读取）
+        last_execution 为 time.monotonic_ns() 的读数，用 time.monotonic_ns() - last_execution 计算距上次执行的时长
+        """
+        return {
+            task_id: {
+                "interval": task.interval,
+                "last_execution": task.last_execution,
+                "pool": pool_name,
+                "running": not task.stop_event.is_set()
             }
+            for task_id, task, pool_name in self._daemon_snapshot
+        }
     
     def shutdown_all_daemons(self):
         """停止所有守护任务"""
         with self._daemon_lock:
-            for task_id in list(self._daemon_tasks.keys()):
+            for task_id, _, _ in self._daemon_snapshot:
                 self.stop_daemon_task(task_id, wait=True)
-    
-    # 修改原有shutdown_pool方法，添加守护任务清理
-    def shutdown_pool(self, name: str, wait: bool = True) -> bool:
-        """关闭指定线程池（重写以清理守护任务）"""
-        # 先停止使用该线程池的所有守护任务
-        with self._daemon_lock:
-            for task_id, task_info in list(self._daemon_tasks.items()):
-                if task_info["pool"] == name:
-                    self.stop_daemon_task(task_id, wait=wait)
-        
-        # 调用原有关闭逻辑
-        return super().shutdown_pool(name, wait)
\ No newline at end of file
@@ -1,154 +1,208 @@
+import collections
+import threading
+import time
+from functools import partial
+from pathlib import Path
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5.QtCore import QObject, QThread,pyqtSignal, pyqtSlot
 
+IMAGE_DIR = Path(__file__).resolve().parent  # 页面图片与本文件放在同一目录
+_PIXMAP_CACHE_SIZE = 32
+_pixmap_cache = collections.OrderedDict()  # {(路径, 宽, 高): 缩放后的 QPixmap}
+
+def _load_scaled_pixmap(path: str, w: int, h: int):
+    """读取并缩放图片，按 (路径, 宽, 高) 缓存最近使用的 32 张；
+    加载失败返回 None 且不缓存，文件之后出现时下次即可加载成功"""
+    key = (path, w, h)
+    scaled = _pixmap_cache.get(key)
+    if scaled is not None:
+        _pixmap_cache.move_to_end(key)
+        return scaled
+    pixmap = QtGui.QPixmap(path)
+    if pixmap.isNull():
+        return None
+    scaled = pixmap.scaled(w, h, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+    _pixmap_cache[key] = scaled
+    if len(_pixmap_cache) > _PIXMAP_CACHE_SIZE:
+        _pixmap_cache.popitem(last=False)
+    return scaled
+
 class PageBase(QtCore.QObject):
     """页面基类，包含通用功能"""
+    # 不声明 __slots__：sip 包装的 QObject 实例本身就带 __dict__ 和弱引用槽，
+    # 子类写 __slots__ 省不了内存，写上 '__weakref__' 还会在类定义时抛 TypeError
+    MAX_LOG_BLOCKS = 1000  # 日志面板最多保留的行数，超出后自动丢弃最早的行；子类可覆盖
+    LOG_FLUSH_INTERVAL = 50  # 日志合并刷新间隔（毫秒），间隔内的多次追加只触发一次排版
+    # 样式表定义为类常量：所有页面共用同一个字符串对象，不必每次 add_page 重新构造
+    _PAGE_QSS = "border: 1px solid black;"
+    _COMBO_QSS = """
+        QComboBox {
+            background-color: white;
+            border: 1px solid #8f8f91;
+            border-radius: 3px;
+            padding: 1px 18px 1px 3px;
+            min-width: 6em;
+        }
+        QComboBox::drop-down {
+            subcontrol-origin: padding;
+            subcontrol-position: top right;
+            width: 15px;
+            border-left-width: 1px;
+            border-left-color: darkgray;
+            border-left-style: solid;
+            border-top-right-radius: 3px;
+            border-bottom-right-radius: 3px;
+        }
+        QComboBox::down-arrow {
+            image: url(images/down_arrow.png);
+            width: 10px;
+            height: 10px;
+        }
+        QComboBox QAbstractItemView {
+            border: 1px solid darkgray;
+            selection-background-color: #a0c0ff;
+            selection-color: black;
+        }
+    """
+    _IMAGE_QSS = """
+        QLabel {
+            background-color: white;
+            border: 1px solid #8f8f91;
+            border-radius: 3px;
+        }
+    """
     def __init__(self, name: str, parent=None):
         super().__init__(parent)
         self.name = name  # 保存页面名称
+        # 默认按钮处理函数的提示文本只与页面名有关，构造时拼好
+        self._btn1_msg = f"Button 1 clicked on {name}"
+        self._btn2_msg = f"Button 2 clicked on {name}"
         self.page = QtWidgets.QWidget(parent)
+        # 两个日志面板各自的待追加队列和单次定时器
+        self._log_queue = collections.deque()
+        self._log_queue_2 = collections.deque()
+        self._log_timer = self._create_flush_timer(self._flush_log)
+        self._log_timer_2 = self._create_flush_timer(self._flush_log_2)
+        self._page_destroyed = False  # 页面控件已销毁时不再追加日志
+        self.page.destroyed.connect(self._on_page_destroyed)
         self.add_page()
+
+    @pyqtSlot()
+    def _on_page_destroyed(self):
+        """页面控件（连同日志面板）销毁后停止日志刷新，之后排队到达的日志直接丢弃"""
+        self._page_destroyed = True
+        self._log_timer.stop()
+        self._log_timer_2.stop()
+
+    def _create_flush_timer(self, slot):
+        timer = QtCore.QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(self.LOG_FLUSH_INTERVAL)
+        timer.timeout.connect(slot)
+        return timer
     
     def add_page(self):
         self.page.setObjectName(self.name)
-        self.page.setStyleSheet("border: 1px solid black;")
+        self.page.setStyleSheet(self._PAGE_QSS)
         
         # 添加页面特定的布局和控件
         self.comboBox = QtWidgets.QComboBox(self.page)
-        self.comboBox.setGeometry(QtCore.QRect(190, 30, 390, 20))
         self.comboBox.setObjectName("comboBox")
-        self.comboBox.setStyleSheet("""
-            QComboBox {
-                background-color: white;
-                border: 1px solid #8f8f91;
-                border-radius: 3px;
-                padding: 1px 18px 1px 3px;
-                min-width: 6em;
-            }
-            QComboBox::drop-down {
-                subcontrol-origin: padding;
-                subcontrol-position: top right;
-                width: 15px;
-                border-left-width: 1px;
-                border-left-color: darkgray;
-                border-left-style: solid;
-                border-top-right-radius: 3px;
-                border-bottom-right-radius: 3px;
-            }
-            QComboBox::down-arrow {
-                image: url(images/down_arrow.png);
-                width: 10px;
-                height: 10px;
-            }
-            QComboBox QAbstractItemView {
-                border: 1px solid darkgray;
-                selection-background-color: #a0c0ff;
-                selection-color: black;
-            }
-        """)
+        self.comboBox.setMinimumWidth(390)
+        self.comboBox.setStyleSheet(self._COMBO_QSS)
         self.comboBox.currentIndexChanged.connect(self.handle_combo_selection)
         
-        self.textEdit = QtWidgets.QTextEdit(self.page)
-        self.textEdit.setGeometry(QtCore.QRect(90, 140, 251, 311))
+        # 日志面板用 QPlainTextEdit：追加时只解析新增片段，不必整篇 toHtml/setHtml
+        self.textEdit = QtWidgets.QPlainTextEdit(self.page)
         self.textEdit.setObjectName("textEdit")
         self.textEdit.setWordWrapMode(QtGui.QTextOption.WrapAtWordBoundaryOrAnywhere)
         self.textEdit.setReadOnly(True)
+        self.textEdit.setMaximumBlockCount(self.MAX_LOG_BLOCKS)
         self.textEdit.ensureCursorVisible()
         
-        self.textEdit_2 = QtWidgets.QTextEdit(self.page)
-        self.textEdit_2.setGeometry(QtCore.QRect(550, 140, 221, 321))
+        self.textEdit_2 = QtWidgets.QPlainTextEdit(self.page)
         self.textEdit_2.setObjectName("textEdit_2")
         self.textEdit_2.setWordWrapMode(QtGui.QTextOption.WrapAtWordBoundaryOrAnywhere)
         self.textEdit_2.setReadOnly(True)
+        self.textEdit_2.setMaximumBlockCount(self.MAX_LOG_BLOCKS)
         self.textEdit_2.ensureCursorVisible()
         
         self.imageLabel = QtWidgets.QLabel(self.page)
-        self.imageLabel.setGeometry(QtCore.QRect(110, 490, 601, 110))
+        self.imageLabel.setFixedSize(601, 110)  # 图片区尺寸固定，缩放后的图片缓存才能一直命中
         self.imageLabel.setObjectName("imageLabel")
-        self.imageLabel.setStyleSheet("""
-            QLabel {
-                background-color: white;
-                border: 1px solid #8f8f91;
-                border-radius: 3px;
-            }
-        """)
+        self.imageLabel.setStyleSheet(self._IMAGE_QSS)
         self.imageLabel.setAlignment(QtCore.Qt.AlignCenter)
         
         self.pushButton = QtWidgets.QPushButton(self.page)
-        self.pushButton.setGeometry(QtCore.QRect(160, 70, 75, 23))
         self.pushButton.setObjectName("pushButton")
+        self.pushButton.setFixedSize(75, 23)
         self.pushButton.clicked.connect(self.on_button1_clicked)
         
         self.pushButton_2 = QtWidgets.QPushButton(self.page)
-        self.pushButton_2.setGeometry(QtCore.QRect(590, 80, 75, 23))
         self.pushButton_2.setObjectName("pushButton_2")
+        self.pushButton_2.setFixedSize(75, 23)
         self.pushButton_2.clicked.connect(self.on_button2_clicked)
+        
+        # 网格布局：窗口缩放时由 Qt 统一重排，两个日志面板随之伸缩
+        layout = QtWidgets.QGridLayout(self.page)
+        layout.setContentsMargins(90, 30, 90, 20)
+        layout.setHorizontalSpacing(200)
+        layout.setVerticalSpacing(20)
+        layout.addWidget(self.comboBox, 0, 0, 1, 2, QtCore.Qt.AlignHCenter)
+        layout.addWidget(self.pushButton, 1, 0, QtCore.Qt.AlignHCenter)
+        layout.addWidget(self.pushButton_2, 1, 1, QtCore.Qt.AlignHCenter)
+        layout.addWidget(self.textEdit, 2, 0)
+        layout.addWidget(self.textEdit_2, 2, 1)
+        layout.addWidget(self.imageLabel, 3, 0, 1, 2, QtCore.Qt.AlignHCenter)
+        layout.setRowStretch(2, 1)
     
     def set_label_image(self, image_path: str):
         if not image_path:
             self.imageLabel.clear()
             return
         
-        pixmap = QtGui.QPixmap(image_path)
-        if pixmap.isNull():
+        # 同一张图在同一尺寸下只解码、缩放一次，切换下拉框时直接复用
+        scaled_pixmap = _load_scaled_pixmap(image_path, self.imageLabel.width(), self.imageLabel.height())
+        if scaled_pixmap is None:
             print(f"错误：无法加载图片 '{image_path}'")
             return
-        
-        scaled_pixmap = pixmap.scaled(
-            self.imageLabel.width(),
-            self.imageLabel.height(),
-            QtCore.Qt.KeepAspectRatio,
-            QtCore.Qt.SmoothTransformation
-        )
         self.imageLabel.setPixmap(scaled_pixmap)
 
     def set_combo_options(self, options: list):
-        self.comboBox.clear()
         if len(options) > 8:
             options = options[:8]
             print(f"警告：下拉框最多支持8个选项，已截断为前8项") 
-        for option in options:
-            self.comboBox.addItem(option)            
+        # 填充期间屏蔽信号，避免 clear/addItem 逐次触发 currentIndexChanged
+        self.comboBox.blockSignals(True)
+        try:
+            self.comboBox.clear()
+            self.comboBox.addItems(options)
+        finally:
+            self.comboBox.blockSignals(False)
         if options:
+            # 填充完成后手动分发一次初始选中项
             self.comboBox.setCurrentIndex(0)
+            self.handle_combo_selection(0)
     
+    @pyqtSlot(int)
     def handle_combo_selection(self, index):
-        selected_text = self.comboBox.currentText()
-        if index == 0:
-            self.comboBox1_1(selected_text)
-        elif index == 1:
-            self.comboBox1_2(selected_text)
-        elif index == 2:
-            self.comboBox1_3(selected_text)
-        elif index == 3:
-            self.comboBox1_4(selected_text)
-        elif index == 4:
-            self.comboBox1_5(selected_text)
-        elif index == 5:
-            self.comboBox1_6(selected_text)
-        elif index == 6:
-            self.comboBox1_7(selected_text)
-        elif index == 7:
-            self.comboBox1_8(selected_text)
+        if index >= 0:  # 清空下拉框时 index 为 -1
+            self.on_combo_selected(index, self.comboBox.currentText())
     
-    # 定义8个槽函数，用户可在子类中重写
-    def comboBox1_1(self, selected_text): pass
-    def comboBox1_2(self, selected_text): pass
-    def comboBox1_3(self, selected_text): pass
-    def comboBox1_4(self, selected_text): pass
-    def comboBox1_5(self, selected_text): pass
-    def comboBox1_6(self, selected_text): pass
-    def comboBox1_7(self, selected_text): pass
-    def comboBox1_8(self, selected_text): pass
+    def on_combo_selected(self, index: int, selected_text: str):
+        """下拉框选中项变化时调用，子类重写并按 index 区分选项"""
+        pass
     
     # 按钮点击事件处理函数 - 需要在子类中重写
+    @pyqtSlot()
     def on_button1_clicked(self):
-        print(f"Button 1 clicked on {self.name} (default handler)")
-        self.set_textEdit_text(f"Button 1 clicked on {self.name}")
+        print(self._btn1_msg, "(default handler)")
+        self.set_textEdit_text(self._btn1_msg)
     
+    @pyqtSlot()
     def on_button2_clicked(self):
-        print(f"Button 2 clicked on {self.name} (default handler)")
-        self.set_textEdit_2_text(f"Button 2 clicked on {self.name}")
+        print(self._btn2_msg, "(default handler)")
+        self.set_textEdit_2_text(self._btn2_msg)
     
     def set_pushButton_text(self, text: str):
         self.pushButton.setText(text)
@@ -157,37 +211,109 @@ class PageBase(QtCore.QObject):
         self.pushButton_2.setText(text)
     
     def set_textEdit_text(self, text: str):
-        formatted_text = text.replace('\n', '<br>').replace(' ', '&nbsp;')
-        current_html = self.textEdit.toHtml()
-        if current_html:
-            current_html += "<br>"
-        new_html = current_html + formatted_text
-        self.textEdit.setHtml(new_html)
-        self.scroll_to_bottom(self.textEdit)
+        if self._page_destroyed:
+            return
+        self._log_queue.append(text)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
     
     def set_textEdit_2_text(self, text: str):
-        formatted_text = text.replace('\n', '<br>').replace(' ', '&nbsp;')
-        current_html = self.textEdit_2.toHtml()
-        if current_html:
-            current_html += "<br>"
-        new_html = current_html + formatted_text
-        self.textEdit_2.setHtml(new_html)
-        self.scroll_to_bottom(self.textEdit_2)
+        if self._page_destroyed:
+            return
+        self._log_queue_2.append(text)
+        if not self._log_timer_2.isActive():
+            self._log_timer_2.start()
+
+    @pyqtSlot()
+    def _flush_log(self):
+        """把队列中积累的日志一次性写入 textEdit"""
+        if self._log_queue:
+            self.append_log(self.textEdit, "\n".join(self._log_queue))
+            self._log_queue.clear()
+
+    @pyqtSlot()
+    def _flush_log_2(self):
+        """把队列中积累的日志一次性写入 textEdit_2"""
+        if self._log_queue_2:
+            self.append_log(self.textEdit_2, "\n".join(self._log_queue_2))
+            self._log_queue_2.clear()
+
+    def append_log(self, text_edit, text: str):
+        """在文本框末尾逐行追加（保留空格），开销只与新增文本长度有关
+        每行单独 appendHtml 成为一个文本块，MAX_LOG_BLOCKS 才能按行数裁剪；
+        追加期间关闭界面刷新，整批写完后只重绘一次"""
+        text_edit.setUpdatesEnabled(False)
+        try:
+            for line in text.split('\n'):
+                text_edit.appendHtml(line.replace(' ', '&nbsp;'))
+        finally:
+            text_edit.setUpdatesEnabled(True)
+        self.scroll_to_bottom(text_edit)
     
     def scroll_to_bottom(self, text_edit):
-        cursor = text_edit.textCursor()
-        cursor.movePosition(QtGui.QTextCursor.End)
-        text_edit.setTextCursor(cursor)
-        text_edit.ensureCursorVisible()
+        # appendHtml 直接写在文档末尾，不依赖光标位置，这里只需滚动到底部，
+        # 不再每次 setTextCursor（会触发光标重绘和额外的布局查询）
         scrollbar = text_edit.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
 
-class DeviceMonitorPage(PageBase,QObject):
+class MonitorWorker(QObject):
+    """设备监控工作对象：moveToThread 到独立线程中运行阻塞的读取循环，
+    读数通过 data_ready 以排队连接送回 GUI 线程"""
+    data_ready = pyqtSignal(str)
+    finished = pyqtSignal()
+    POLL_INTERVAL = 0.02  # 两次读取之间的间隔（秒）
+    # 读数合并发送的最短间隔（秒），须远大于 POLL_INTERVAL，每次约合并 10 条读数跨线程投递
+    EMIT_INTERVAL = 0.2
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._stop = threading.Event()
+        self._pending = []  # 尚未发送的读数
+
+    @pyqtSlot()
+    def run(self):
+        """读取循环（阻塞），在工作线程中执行"""
+        last_emit = time.monotonic()
+        thread = QThread.currentThread()
+        while not self._stop.is_set() and not thread.isInterruptionRequested():
+            reading = self.read_device()
+            if reading:
+                self._pending.append(reading)
+            now = time.monotonic()
+            if self._pending and now - last_emit >= self.EMIT_INTERVAL:
+                self._flush()
+                last_emit = now
+            self._stop.wait(self.POLL_INTERVAL)
+        self._flush()
+        self.finished.emit()
+
+    def _flush(self):
+        """把积累的读数合并成一次 data_ready 发出"""
+        if self._pending:
+            self.data_ready.emit("\n".join(self._pending))
+            self._pending.clear()
+
+    def read_device(self) -> str:
+        """读取一次设备数据，接入真实设备时重写（可以阻塞，不影响界面）"""
+        return f"{time.strftime('%H:%M:%S')} 设备在线"
+
+    def stop(self):
+        # 可从任意线程调用，Event.set 会立即唤醒 wait
+        self._stop.set()
+
+class DeviceMonitorPage(PageBase):
     """设备监控页面 - 定制化实现"""
     test=pyqtSignal(str)
+    _IMAGES = (str(IMAGE_DIR / "1.png"), str(IMAGE_DIR / "2.png"))  # 前两个选项对应的图片，选中时才加载
     def __init__(self, name: str, parent=None):
         super().__init__(name, parent)
-  
+        self._thread = None  # 监控线程
+        self._worker = None  # 运行在监控线程中的 MonitorWorker
+        # 页面控件销毁或程序退出时停止并等待监控线程，避免 "QThread: Destroyed while thread is still running"
+        self.page.destroyed.connect(self.stop_monitor)
+        app = QtCore.QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_monitor)
         
         self.set_pushButton_text("开始监控")
         self.set_pushButton_2_text("停止监控")
@@ -197,24 +323,49 @@ class DeviceMonitorPage(PageBase,QObject):
         self.set_combo_options(devices)
         self.pushButton.clicked.connect(self.on_button1_clicked1)
         self.test.connect(self.on_test)
-    def on_test(str):
-        str=str
-        print("测试emit",str)
+    @pyqtSlot(str)
+    def on_test(self, msg: str):
+        print("测试emit", msg)
+    @pyqtSlot()
     def on_button1_clicked1(self):
         print("槽函数复用")
+    @pyqtSlot()
     def on_button1_clicked(self):
         print("开始监控按钮被点击")
+        if self._thread is not None:
+            return
         self.set_textEdit_text("开始监控设备...")
         self.test.emit("1")
+        # 阻塞的设备读取放到工作线程，GUI 线程只负责显示
+        self._thread = QThread(self)
+        self._worker = MonitorWorker()
+        self._worker.moveToThread(self._thread)
+        self._worker.data_ready.connect(self.set_textEdit_2_text, QtCore.Qt.QueuedConnection)
+        self._thread.started.connect(self._worker.run)
+        self._worker.finished.connect(self._thread.quit)
+        self._thread.finished.connect(self._worker.deleteLater)
+        self._thread.start()
+    @pyqtSlot()
     def on_button2_clicked(self):
         print("停止监控按钮被点击")
         self.set_textEdit_text("停止监控设备...")
         self.test.emit("2")
-    def comboBox1_1(self, selected_text):
-        self.set_label_image(r"E:\aliyun\ui\1.png")
-    
-    def comboBox1_2(self, selected_text):
-        self.set_label_image(r"E:\aliyun\ui\2.png")
+        self.stop_monitor()
+
+    @pyqtSlot()
+    def stop_monitor(self):
+        """停止监控线程并等待其退出（可重复调用）"""
+        if self._thread is None:
+            return
+        self._worker.stop()
+        self._thread.requestInterruption()
+        self._thread.quit()
+        self._thread.wait()
+        self._thread = None
+        self._worker = None
+    def on_combo_selected(self, index, selected_text):
+        if index < len(self._IMAGES):
+            self.set_label_image(self._IMAGES[index])
 
 class SpectrumAnalysisPage(PageBase):
     """频谱分析页面 - 定制化实现"""
@@ -224,10 +375,12 @@ class SpectrumAnalysisPage(PageBase):
         self.set_pushButton_2_text("导出数据")
         self.set_textEdit_text("频谱分析页面已加载")
     
+    @pyqtSlot()
     def on_button1_clicked(self):
         print("分析频谱按钮被点击")
         self.set_textEdit_text("正在分析频谱数据...")
     
+    @pyqtSlot()
     def on_button2_clicked(self):
         print("导出数据按钮被点击")
         self.set_textEdit_text("正在导出频谱数据...")
@@ -240,10 +393,12 @@ class LogViewPage(PageBase):
         self.set_pushButton_2_text("清除日志")
         self.set_textEdit_text("日志查看页面已加载")
     
+    @pyqtSlot()
     def on_button1_clicked(self):
         print("刷新日志按钮被点击")
         self.set_textEdit_text("正在刷新日志...")
     
+    @pyqtSlot()
     def on_button2_clicked(self):
         print("清除日志按钮被点击")
         self.set_textEdit_text("正在清除日志...")
@@ -258,10 +413,12 @@ class PluginPage1(PageBase):
         plugins = ["插件功能1", "插件功能2", "高级分析", "数据导出", "系统优化"]
         self.set_combo_options(plugins)
     
+    @pyqtSlot()
     def on_button1_clicked(self):
         print("运行插件按钮被点击")
         self.set_textEdit_text("正在运行插件功能...")
     
+    @pyqtSlot()
     def on_button2_clicked(self):
         print("停止插件按钮被点击")
         self.set_textEdit_text("插件功能已停止")
@@ -276,16 +433,33 @@ class PluginPage2(PageBase):
         tools = ["工具A", "工具B", "工具C", "工具D"]
         self.set_combo_options(tools)
     
+    @pyqtSlot()
     def on_button1_clicked(self):
         print("启动工具按钮被点击")
         self.set_textEdit_text("工具已启动...")
     
+    @pyqtSlot()
     def on_button2_clicked(self):
         print("保存结果按钮被点击")
         self.set_textEdit_text("结果已保存")
 
 class CreateStackedWidget():
     """创建和管理堆叠窗口的类，自动生成页面切换按钮"""
+    _BUTTON_QSS = """
+        QPushButton {
+            background-color: #e0e0e0;
+            border: 1px solid #aaa;
+            border-radius: 4px;
+            padding: 2px;
+        }
+        QPushButton:hover {
+            background-color: #d0d0d0;
+        }
+        QPushButton:checked {
+            background-color: #a0c0ff;
+            font-weight: bold;
+        }
+    """
     def __init__(self, parent=None):
         self.container = QtWidgets.QWidget(parent)
         self.container.setObjectName("stackedWidgetContainer")
@@ -309,54 +483,75 @@ class CreateStackedWidget():
         self.layout.addWidget(self.stackedWidget)
         
         self.pages = {}  # 存储所有页面的字典
+        self._pending = {}  # 尚未构造的页面：页面名 -> (factory, 占位控件)
+        self._name_to_index = {}  # 页面名 -> 堆叠窗口中的索引
+        self._current_name = None  # 当前选中按钮对应的页面名
         self.buttons = {}  # 存储所有按钮的字典
     
-    def add_page(self, page_instance):
-        page_name = page_instance.name
-        
-        self.stackedWidget.addWidget(page_instance.page)
-        self.pages[page_name] = page_instance
+    def add_page(self, page, factory=None):
+        """添加页面：page 为页面实例；或 page 为页面名、factory 为 factory(page_name) -> 页面实例，
+        此时先放一个空白占位控件，首次切换到该页时才真正构造（第一个页面默认显示，立即构造）"""
+        first = not self.buttons
+        if factory is None:
+            page_instance = page
+            page_name = page_instance.name
+            self._name_to_index[page_name] = self.stackedWidget.addWidget(page_instance.page)
+            self.pages[page_name] = page_instance
+        else:
+            page_name = page
+            placeholder = QtWidgets.QWidget()
+            placeholder.setObjectName(page_name)
+            self._name_to_index[page_name] = self.stackedWidget.addWidget(placeholder)
+            self._pending[page_name] = (factory, placeholder)
+            page_instance = self._build_page(page_name) if first else None
         
         button = QtWidgets.QPushButton(self.button_container)
         button.setText(page_name)
         button.setFixedSize(80, 25)
-        button.setStyleSheet("""
-            QPushButton {
-                background-color: #e0e0e0;
-                border: 1px solid #aaa;
-                border-radius: 4px;
-                padding: 2px;
-            }
-            QPushButton:hover {
-                background-color: #d0d0d0;
-            }
-            QPushButton:checked {
-                background-color: #a0c0ff;
-                font-weight: bold;
-            }
-        """)
+        button.setStyleSheet(self._BUTTON_QSS)
         button.setCheckable(True)
-        button.clicked.connect(lambda: self.set_current_page(page_name))
+        button.clicked.connect(partial(self.set_current_page, page_name))
         self.button_layout.addWidget(button)
         self.buttons[page_name] = button
         
-        if len(self.pages) == 1:
+        if first:
             button.setChecked(True)
+            self._current_name = page_name
         
         return page_instance
+
+    def _build_page(self, page_name: str):
+        """构造延迟页面，并用它替换堆叠窗口中的占位控件"""
+        factory, placeholder = self._pending.pop(page_name)
+        page_instance = factory(page_name)
+        index = self._name_to_index[page_name]  # 插入后占位控件被挤到 index+1 再移除，其余页面索引不变
+        self.stackedWidget.insertWidget(index, page_instance.page)
+        self.stackedWidget.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.pages[page_name] = page_instance
+        return page_instance
     
     def get_page(self, page_name: str):
+        if page_name in self._pending:
+            return self._build_page(page_name)
         return self.pages.get(page_name)
     
-    def set_current_page(self, page_name: str):
-        for name, button in self.buttons.items():
-            button.setChecked(name == page_name)
-        
-        for i in range(self.stackedWidget.count()):
-            if self.stackedWidget.widget(i).objectName() == page_name:
-                self.stackedWidget.setCurrentIndex(i)
-                return True
-        return False
+    def set_current_page(self, page_name: str, _checked: bool = False):
+        # _checked 接收 clicked(bool) 携带的选中状态，按钮直接以 partial 连接到本方法
+        index = self._name_to_index.get(page_name)
+        if index is None:
+            return False
+        if page_name in self._pending:
+            self._build_page(page_name)
+        self.stackedWidget.setCurrentIndex(index)
+        
+        # 只切换新旧两个按钮的选中状态
+        old_button = self.buttons.get(self._current_name)
+        if old_button is not None and self._current_name != page_name:
+            old_button.setChecked(False)
+        self.buttons[page_name].setChecked(True)
+        self._current_name = page_name
+        return True
     
     def widget(self):
         return self.container
@@ -396,17 +591,23 @@ class Ui_MainWindow(object):
         
         # 左侧面板内容
         self.textBrowser_2 = QtWidgets.QTextBrowser(self.leftPanel)
-        self.textBrowser_2.setGeometry(QtCore.QRect(0, 0, 171, 241))
         self.textBrowser_2.setObjectName("textBrowser_2")
         
         self.textBrowser_3 = QtWidgets.QTextBrowser(self.leftPanel)
-        self.textBrowser_3.setGeometry(QtCore.QRect(0, 300, 171, 341))
         self.textBrowser_3.setObjectName("textBrowser_3")
         
         self.button_note_name = QtWidgets.QPushButton(self.leftPanel)
-        self.button_note_name.setGeometry(QtCore.QRect(80, 240, 75, 23))
         self.button_note_name.setObjectName("button_note_name")
         self.button_note_name.clicked.connect(self.on_note_name_clicked)
+        self.button_note_name.setFixedSize(75, 23)
+        
+        self.leftPanelLayout = QtWidgets.QVBoxLayout(self.leftPanel)
+        self.leftPanelLayout.setContentsMargins(0, 0, 0, 0)
+        self.leftPanelLayout.setSpacing(0)
+        self.leftPanelLayout.addWidget(self.textBrowser_2, 4)
+        self.leftPanelLayout.addWidget(self.button_note_name, 0, QtCore.Qt.AlignRight)
+        self.leftPanelLayout.addSpacing(36)
+        self.leftPanelLayout.addWidget(self.textBrowser_3, 6)
         
         self.horizontalLayout.addWidget(self.leftPanel)
         
@@ -426,18 +627,14 @@ class Ui_MainWindow(object):
         self.outer_stacked_widget.setCurrentIndex(0)
         
         # 为主堆叠窗口添加页面
-        self.device_page = DeviceMonitorPage("设备监控")
-        self.spectrum_page = SpectrumAnalysisPage("频谱分析")
-        self.log_page = LogViewPage("日志查看")
-        self.main_stacked_manager.add_page(self.device_page)
-        self.main_stacked_manager.add_page(self.spectrum_page)
-        self.main_stacked_manager.add_page(self.log_page)
+        # 页面类本身作为 factory 传入，首次切换到该页时才构造；需要页面实例时用 get_page(页面名)
+        self.main_stacked_manager.add_page("设备监控", DeviceMonitorPage)
+        self.main_stacked_manager.add_page("频谱分析", SpectrumAnalysisPage)
+        self.main_stacked_manager.add_page("日志查看", LogViewPage)
         
         # 为插件堆叠窗口添加页面
-        self.plugin_page1 = PluginPage1("插件功能1")
-        self.plugin_page2 = PluginPage2("插件功能2")
-        self.plugin_stacked_manager.add_page(self.plugin_page1)
-        self.plugin_stacked_manager.add_page(self.plugin_page2)
+        self.plugin_stacked_manager.add_page("插件功能1", PluginPage1)
+        self.plugin_stacked_manager.add_page("插件功能2", PluginPage2)
         
         # 创建右侧布局（包含外层堆叠窗口）
         self.rightLayout = QtWidgets.QVBoxLayout()
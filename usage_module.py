@@ -6,26 +6,20 @@ from base_module import BaseModule
 class TestModuleA(BaseModule):
     def __init__(self):
         super().__init__()
-    @property
-    def module_name(self):
-        return "test_module_a"
+    module_name = "test_module_a"
 
 class TestModuleB(BaseModule):
     def __init__(self):
         super().__init__()
         print("当前注册模块：", list(BaseModule._module_manespace.values()))
-    @property
-    def module_name(self):
-        return "test_module_b"
+    module_name = "test_module_b"
 
 class TestModuleC(BaseModule):
 
     def __init__(self):
         super().__init__()
         print("当前注册模块：", self.module_name)
-    @property
-    def module_name(self):
-        return "test_module_c"
+    module_name = "test_module_c"
 
 # 在应用启动前验证模块注册
 